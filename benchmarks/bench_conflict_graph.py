@@ -0,0 +1,164 @@
+"""
+Vectorized vs per-pair conflict-graph construction on long multi-sentence states,
+and exact vs LSH-approximate construction for long documents, and the scaling and
+recall of ``approximate_relations`` on planted near-duplicate pairs.
+
+    python benchmarks/bench_conflict_graph.py --sentences 50 100 200
+    python benchmarks/bench_conflict_graph.py --approx 500 1000 2000 4000
+    python benchmarks/bench_conflict_graph.py --lsh 1000 4000 16000 64000
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import torch
+
+from urva.config import DEFAULT_CONFIG
+from urva.pipeline.inference import InferencePipeline
+from urva.reasoning.conflict_graph import ConflictGraph
+from urva.graph.contradiction import ContradictionGraph
+from urva.graph.lsh import HyperplaneLSH, approximate_relations
+
+WORDS = "the evidence data claim result answer model fact rule value is was not never no cannot holds".split()
+
+
+def make_sentences(n, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))) for _ in range(n)]
+
+
+def legacy_relation(sim, a, b):
+    neg_tokens = {"not", "never", "no", "cannot"}
+    has_neg_a = any(tok in a.lower() for tok in neg_tokens)
+    has_neg_b = any(tok in b.lower() for tok in neg_tokens)
+    if sim > 0.65 and has_neg_a != has_neg_b:
+        return "contradiction"
+    if sim > 0.7:
+        return "entailment"
+    if sim < 0.2 and has_neg_a != has_neg_b:
+        return "contradiction"
+    return "neutral"
+
+
+def legacy_pair_relation(pipe, a, b):
+    ea, eb = pipe._embed_sentence(a), pipe._embed_sentence(b)
+    if ea.norm() == 0 or eb.norm() == 0:
+        return "neutral"
+    return legacy_relation(float(torch.dot(ea, eb) / (ea.norm() * eb.norm() + 1e-8)), a, b)
+
+
+def legacy_rel_type(graph, a, b):
+    ea, eb = graph._embed(a), graph._embed(b)
+    return legacy_relation(float(np.dot(ea, eb) / (np.linalg.norm(ea) * np.linalg.norm(eb) + 1e-8)), a, b)
+
+
+def legacy_pipeline_edges(pipe, sentences):
+    return [
+        {"a": sentences[i], "b": sentences[j], "type": legacy_pair_relation(pipe, sentences[i], sentences[j])}
+        for i in range(len(sentences)) for j in range(i + 1, len(sentences))
+    ]
+
+
+def legacy_graph_edges(graph, sentences):
+    return [
+        {"a": sentences[i], "b": sentences[j], "type": legacy_rel_type(graph, sentences[i], sentences[j])}
+        for i in range(len(sentences)) for j in range(i + 1, len(sentences))
+    ]
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--approx", type=int, nargs="+", default=None)
+    parser.add_argument("--lsh", type=int, nargs="+", default=None)
+    parser.add_argument("--max-bands", type=int, default=32)
+    args = parser.parse_args()
+    if args.approx:
+        return bench_approximate(args.approx)
+    if args.lsh:
+        return bench_lsh(args.lsh, args.max_bands)
+
+    pipe = InferencePipeline(None, None, None, DEFAULT_CONFIG.copy(), None)
+    graph = ConflictGraph()
+    for n in args.sentences:
+        sentences = make_sentences(n)
+        states = {"S1": ". ".join(sentences[: n // 3]), "S2": ". ".join(sentences[n // 3: 2 * n // 3]),
+                  "S3": ". ".join(sentences[2 * n // 3:])}
+        split = [s for k in ["S1", "S2", "S3"] for s in pipe._sentence_split(states[k])]
+
+        fast, t_fast = timed(pipe._build_conflict_graph, states)
+        slow, t_slow = timed(legacy_pipeline_edges, pipe, split)
+        assert fast["edges"].to_dicts() == slow, "pipeline graph edges diverged"
+        print(f"pipeline      n={n:4d} pairs={len(slow):6d} loop={t_slow:.3f}s vectorized={t_fast:.3f}s "
+              f"speedup={t_slow / max(t_fast, 1e-9):.1f}x")
+
+        fast, t_fast = timed(graph.build, split)
+        slow, t_slow = timed(legacy_graph_edges, graph, split)
+        assert fast["edges"].to_dicts() == slow, "ConflictGraph edges diverged"
+        print(f"ConflictGraph n={n:4d} pairs={len(slow):6d} loop={t_slow:.3f}s vectorized={t_fast:.3f}s "
+              f"speedup={t_slow / max(t_fast, 1e-9):.1f}x")
+
+
+def bench_approximate(sizes):
+    cfg = DEFAULT_CONFIG.copy()
+    exact_pipe = InferencePipeline(None, None, None, {**cfg, "graph": {"approximate": False}}, None)
+    approx_pipe = InferencePipeline(None, None, None, {**cfg, "graph": {"approximate": True, "approx_min_sentences": 2}}, None)
+    for n in sizes:
+        states = {"S1": ". ".join(make_sentences(n)), "S2": "", "S3": ""}
+        exact, t_exact = timed(exact_pipe._build_conflict_graph, states)
+        approx, t_approx = timed(approx_pipe._build_conflict_graph, states)
+        print(f"pipeline           n={n:5d} exact={t_exact:.3f}s ({len(exact['edges'])} edges) "
+              f"approx={t_approx:.3f}s ({len(approx['edges'])} edges) "
+              f"conflict {exact['conflict_score']:.4f} vs {approx['conflict_score']:.4f}")
+        split = exact_pipe._sentence_split(states["S1"])
+        exact, t_exact = timed(ContradictionGraph().build, split)
+        approx, t_approx = timed(ContradictionGraph(approximate=True, approx_min_nodes=2).build, split)
+        print(f"ContradictionGraph n={n:5d} exact={t_exact:.3f}s approx={t_approx:.3f}s "
+              f"conflict {exact.conflict_score:.4f} vs {approx.conflict_score:.4f}")
+
+
+def planted_embeddings(n, cosines, dim=128, seed=0):
+    """Random sentence-like embeddings where pairs (2k, 2k + 1) of the first rows sit at ``cosines``."""
+    rng = np.random.default_rng(seed)
+    emb = rng.normal(size=(n, dim))
+    planted = {}
+    for k, cos in enumerate(cosines * (n // (20 * len(cosines)))):
+        a, b = 2 * k, 2 * k + 1
+        u = emb[a] / np.linalg.norm(emb[a])
+        w = emb[b] - (emb[b] @ u) * u
+        emb[b] = cos * u + math.sqrt(1 - cos * cos) * w / np.linalg.norm(w)
+        planted.setdefault(cos, []).append(a * n + b)
+    return emb, planted
+
+
+def bench_lsh(sizes, max_bands):
+    cosines = [0.72, 0.8, 0.88, 0.95]
+    prev = None
+    for n in sizes:
+        emb, planted = planted_embeddings(n, cosines)
+        neg = np.zeros(n, dtype=bool)
+        lsh = HyperplaneLSH.for_threshold(emb.shape[1], n, max_bands=max_bands)
+        approx, t = timed(approximate_relations, emb, neg, 0.95, 4096, max_bands)
+        found = set((approx["rows"] * n + approx["cols"]).tolist())
+        recall = " ".join(f"{c}:{np.mean([k in found for k in keys]):.2f}/{lsh.expected_recall(c):.2f}"
+                          for c, keys in planted.items())
+        slope = f" slope={math.log(t / prev[1]) / math.log(n / prev[0]):.2f}" if prev else ""
+        print(f"lsh n={n:6d} bands={lsh.bands} bits={lsh.bits} {t:.3f}s{slope} "
+              f"recall found/expected {recall}")
+        prev = (n, t)
+
+
+if __name__ == "__main__":
+    main()
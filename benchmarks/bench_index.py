@@ -0,0 +1,107 @@
+"""
+Startup cost of a persisted ``VectorStore`` index vs rebuilding it by re-embedding
+every document: ``open(mmap=True)`` (zero-copy), ``open(mmap=False)`` (read into
+memory), first and steady query latency, an in-place append, and forked workers
+opening the same page-cached index. Rebuild time is extrapolated from a sample.
+
+    python benchmarks/bench_index.py
+    python benchmarks/bench_index.py --docs 1000000 --dim 256 --workers 4
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from urva.utils.retrieval import VectorStore
+
+
+def _worker(conn, path, query):
+    t0 = time.perf_counter()
+    store = VectorStore.open(path)
+    t_open = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    top = store.search(query, 5)
+    conn.send((t_open, time.perf_counter() - t0, top[0][0]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--embed-sample", type=int, default=20_000)
+    parser.add_argument("--append", type=int, default=1_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--path", default=None, help="index directory (default: a temp dir)")
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "index")
+    ids = [f"doc-{i}" for i in range(args.docs)]
+    store = VectorStore(dim=args.dim)
+    t0 = time.perf_counter()
+    for i in ids[: args.embed_sample]:
+        store.embed(f"text of {i}")
+    t_rebuild = (time.perf_counter() - t0) / args.embed_sample * args.docs
+
+    rng = np.random.default_rng(0)
+    for start in range(0, args.docs, 65536):
+        chunk = ids[start:start + 65536]
+        store.add_vectors(chunk, rng.normal(size=(len(chunk), args.dim)))
+    t0 = time.perf_counter()
+    store.save(path)
+    t_save = time.perf_counter() - t0
+    size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+    query = rng.normal(size=args.dim)
+    t0 = time.perf_counter()
+    mapped = VectorStore.open(path)
+    t_open = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    first = mapped.search(query, 5)
+    t_first = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    steady = mapped.search(query, 5)
+    t_steady = time.perf_counter() - t0
+    assert first == steady == store.search(query, 5)
+
+    t0 = time.perf_counter()
+    loaded = VectorStore.open(path, mmap=False)
+    t_load = time.perf_counter() - t0
+    del loaded
+
+    extra = rng.normal(size=(args.append, args.dim))
+    t0 = time.perf_counter()
+    mapped.add_vectors([f"new-{i}" for i in range(args.append)], extra)
+    t_append = time.perf_counter() - t0
+    assert mapped.search(extra[7], 1)[0][0] == "new-7" and len(VectorStore.open(path)) == args.docs + args.append
+
+    ctx = mp.get_context("fork")
+    pipes, procs = [], []
+    for _ in range(args.workers):
+        parent, child = ctx.Pipe()
+        proc = ctx.Process(target=_worker, args=(child, path, query))
+        proc.start()
+        pipes.append(parent)
+        procs.append(proc)
+    results = [p.recv() for p in pipes]
+    for proc in procs:
+        proc.join()
+    assert all(top == first[0][0] for _, _, top in results)
+
+    print(f"docs={args.docs:,} dim={args.dim} index={size / 1e6:,.1f}MB at {path}")
+    print(f"rebuild by re-embedding (extrapolated) {t_rebuild:,.1f}s | save {t_save:.2f}s")
+    print(f"open mmap {t_open * 1e3:.2f}ms | open into memory {t_load:.2f}s")
+    print(f"search first {t_first * 1e3:.1f}ms steady {t_steady * 1e3:.1f}ms | "
+          f"append {args.append:,} docs {t_append * 1e3:.1f}ms")
+    print(f"{args.workers} forked workers: open {max(r[0] for r in results) * 1e3:.2f}ms "
+          f"first search {max(r[1] for r in results) * 1e3:.1f}ms (max)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Compiled single-pass LogicEngine vs the previous per-call implementation on the trap
+datasets (claims and corrections), without and with the in-engine memo. Violations
+are checked for equality first.
+
+    python benchmarks/bench_logic_engine.py --repeat 200
+    python benchmarks/bench_logic_engine.py --repeat 200 --no-spacy
+"""
+import argparse
+import glob
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from urva.logic.engine import LogicEngine
+
+LEGACY_NLP = None
+
+
+def legacy_apply_rules(text):
+    nlp = LEGACY_NLP
+    violations = []
+    text_lower = text.lower()
+    doc = nlp(text) if nlp else None
+    if doc:
+        has_neg = any(tok.dep_ == "neg" for tok in doc)
+        has_aff = any(tok.pos_ == "VERB" and tok.dep_ != "neg" for tok in doc)
+        if has_neg and has_aff:
+            violations.append({"rule": "NegationConflict", "category": "LOGICAL",
+                               "detail": "Negation detected via dependency parse"})
+    else:
+        for pos, neg in [(r"\bis\b", r"\bis not\b"), (r"\bwas\b", r"\bwas not\b"), (r"\bcan\b", r"\bcannot\b")]:
+            if re.search(pos, text_lower) and re.search(neg, text_lower):
+                violations.append({"rule": "NegationConflict", "category": "LOGICAL",
+                                   "detail": "Affirmative and negated claims coexist"})
+                break
+    if doc:
+        entities = [ent.text for ent in doc.ents]
+    else:
+        entities = re.findall(r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b', text)
+    if len(entities) != len(set(entities)):
+        seen = {}
+        for e in entities:
+            seen[e] = seen.get(e, 0) + 1
+        if any(v > 2 for v in seen.values()):
+            violations.append({"rule": "EntityMismatch", "category": "FACTUAL",
+                               "detail": "Repeated conflicting entity references"})
+    numbers = re.findall(r'\b\d+(?:\.\d+)?\b', text)
+    if len(numbers) >= 2:
+        nums = [float(n) for n in numbers]
+        if max(nums) > 10 * min(nums) and min(nums) > 0:
+            violations.append({"rule": "NumericInconsistency", "category": "NUMERIC",
+                               "detail": f"Suspicious numeric range: {min(nums)} vs {max(nums)}"})
+    valid_labels = {"supports", "refutes", "not enough info", "hallucinated", "supported", "yes", "no"}
+    label_tokens = set(text_lower.split()) & valid_labels
+    if len(label_tokens) > 1:
+        violations.append({"rule": "LabelViolation", "category": "LOGICAL",
+                           "detail": f"Multiple conflicting labels: {label_tokens}"})
+    markers = ["definitely", "certainly", "always", "never", "impossible", "guaranteed", "proven"]
+    found = [m for m in markers if m in text_lower]
+    if found:
+        violations.append({"rule": "UnsupportedAssertion", "category": "FACTUAL",
+                           "detail": f"Strong unsupported assertion markers: {found}"})
+    return violations
+
+
+def load_texts(pattern):
+    texts = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            content = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            content = raw.decode("cp1252")
+        for item in json.loads(content):
+            texts.extend(str(item[k]) for k in ("claim", "correction") if item.get(k))
+    return texts
+
+
+def timed(fn, texts, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for t in texts:
+            fn(t)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="datasets/trap_*.json")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--no-spacy", action="store_true", help="time the rule logic alone (regex fallbacks)")
+    args = parser.parse_args()
+    global LEGACY_NLP
+
+    texts = load_texts(args.data)
+    spacy_model = None if args.no_spacy else "en_core_web_sm"
+    # built-in rules only: the declarative "checks" have no legacy counterpart
+    engine = LogicEngine({}, spacy_model=spacy_model, memo_size=0)
+    memo_engine = LogicEngine({}, spacy_model=spacy_model)
+    LEGACY_NLP = engine.nlp
+    for t in texts:
+        assert engine.apply_rules(t) == legacy_apply_rules(t), f"violations diverged on: {t!r}"
+
+    t_old = timed(legacy_apply_rules, texts, args.repeat)
+    t_new = timed(engine.apply_rules, texts, args.repeat)
+    t_memo = timed(memo_engine.apply_rules, texts, args.repeat)
+    calls = len(texts) * args.repeat
+    print(f"texts={len(texts)} calls={calls} spacy={engine.nlp is not None}")
+    print(f"legacy   {t_old:.3f}s ({calls / t_old:,.0f} texts/s)")
+    print(f"compiled {t_new:.3f}s ({calls / t_new:,.0f} texts/s) speedup={t_old / max(t_new, 1e-9):.2f}x")
+    print(f"memoized {t_memo:.3f}s ({calls / t_memo:,.0f} texts/s) speedup={t_old / max(t_memo, 1e-9):.2f}x "
+          f"hit_rate={memo_engine.memo_stats()['hit_rate']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Peak memory and latency of ``MultiHopReasoner`` on very long inputs, full-length
+encoding vs streaming in ``max_context`` chunks. Each run happens in a fresh forked
+process so its peak RSS is measured in isolation.
+
+    python benchmarks/bench_long_context.py
+    python benchmarks/bench_long_context.py --lengths 10000 100000 1000000 --max-context 4096
+"""
+import argparse
+import multiprocessing as mp
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import torch
+
+from urva.config import DEFAULT_CONFIG
+from urva.models.reasoner import MultiHopReasoner
+
+
+def _measure(conn, length, max_context):
+    torch.manual_seed(0)
+    reasoner = MultiHopReasoner({**DEFAULT_CONFIG, "reasoner": {"max_context": max_context}})
+    text = ("The committee reviewed the evidence carefully. " * (length // 48 + 1))[:length]
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    with torch.no_grad():
+        state = reasoner.forward_batch([text])[0]
+    elapsed = time.perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    conn.send((elapsed, (peak - base) / 1024, state["S1"], state["final_score"]))
+
+
+def run(length, max_context):
+    ctx = mp.get_context("fork")
+    parent, child = ctx.Pipe()
+    proc = ctx.Process(target=_measure, args=(child, length, max_context))
+    proc.start()
+    result = parent.recv()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--max-context", type=int, default=4096)
+    args = parser.parse_args()
+
+    for length in args.lengths:
+        t_full, mb_full, s1_full, score_full = run(length, None)
+        t_chunk, mb_chunk, s1_chunk, score_chunk = run(length, args.max_context)
+        assert s1_full == s1_chunk and abs(score_full - score_chunk) < 1e-5
+        print(f"chars={length:<9,} full {t_full:.2f}s +{mb_full:,.1f}MB | "
+              f"streamed({args.max_context}) {t_chunk:.2f}s +{mb_chunk:,.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
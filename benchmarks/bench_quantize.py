@@ -0,0 +1,94 @@
+"""
+fp32 vs int8 dynamic quantization of the grounder/reasoner on the bundled datasets:
+model size and pipeline latency. The accuracy regression check (``compare_outputs``)
+lives in tests/test_pipeline.py.
+
+    python benchmarks/bench_quantize.py
+    python benchmarks/bench_quantize.py --limit 500 --batch-size 32
+"""
+import argparse
+import glob
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import torch
+
+from urva.checks.hallucination import HallucinationChecker
+from urva.config import DEFAULT_CONFIG
+from urva.core.quantize import model_nbytes, quantize_module
+from urva.logic.engine import LogicEngine
+from urva.models.grounder import FactGrounder
+from urva.models.reasoner import MultiHopReasoner
+from urva.pipeline.inference import InferencePipeline
+from urva.utils.seed import set_seed
+
+
+def load_items(pattern, limit):
+    items = []
+    for path in sorted(glob.glob(pattern)):
+        if path.endswith("logic_rules.json"):
+            continue
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            content = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            content = raw.decode("cp1252")
+        for entry in json.loads(content):
+            text = entry.get("text") or entry.get("claim") or entry.get("fact") or entry.get("question")
+            if text:
+                items.append({"id": f"{path}:{entry.get('id', len(items))}", "text": str(text)})
+    return items[:limit] if limit else items
+
+
+def run(pipeline, items, batch_size, speed):
+    outputs = []
+    t0 = time.perf_counter()
+    with torch.no_grad():
+        for i in range(0, len(items), batch_size):
+            outputs.extend(pipeline.run_batch(items[i:i + batch_size], speed=speed))
+    return outputs, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="datasets/*.json")
+    parser.add_argument("--rules", default="datasets/logic_rules.json")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--speed", default="balanced")
+    parser.add_argument("--no-spacy", action="store_true")
+    args = parser.parse_args()
+
+    cfg = DEFAULT_CONFIG
+    set_seed(cfg["seed"])
+    items = load_items(args.data, args.limit)
+    logic = LogicEngine.from_file(args.rules, spacy_model=None if args.no_spacy else "en_core_web_sm")
+    checker = HallucinationChecker(logic)
+    grounder, reasoner = FactGrounder(cfg), MultiHopReasoner(cfg)
+    fp32 = InferencePipeline(grounder, reasoner, checker, cfg, logic)
+
+    size_fp32 = model_nbytes(grounder) + model_nbytes(reasoner)
+    # warm the logic memo so both timings measure the models, not spaCy
+    run(fp32, items, args.batch_size, args.speed)
+    _, t_fp32 = run(fp32, items, args.batch_size, args.speed)
+
+    quantize_module(grounder)
+    quantize_module(reasoner)
+    size_int8 = model_nbytes(grounder) + model_nbytes(reasoner)
+    int8 = InferencePipeline(grounder, reasoner, checker, {**cfg, "quantize": "int8"}, logic)
+    _, t_int8 = run(int8, items, args.batch_size, args.speed)
+
+    n = len(items)
+    print(f"items={n} batch_size={args.batch_size} threads={torch.get_num_threads()}")
+    print(f"fp32 {t_fp32:.3f}s ({n / t_fp32:,.1f} items/s) weights={size_fp32 / 1e6:.2f}MB")
+    print(f"int8 {t_int8:.3f}s ({n / t_int8:,.1f} items/s) weights={size_int8 / 1e6:.2f}MB "
+          f"speedup={t_fp32 / t_int8:.2f}x size={size_int8 / size_fp32:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Matrix-backed ``VectorStore`` vs the previous list-of-vectors store: one matvec +
+``argpartition`` per query and one matmul per query batch, against a Python loop of
+cosines and a full sort. Top-k ids are checked for equality first.
+
+    python benchmarks/bench_retrieval.py
+    python benchmarks/bench_retrieval.py --sizes 10000 100000 1000000 --queries 64 --top-k 10
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from urva.utils.retrieval import VectorStore
+
+
+def legacy_search(docs, q_emb, top_k):
+    sims = []
+    for doc_id, emb in docs:
+        sim = float(np.dot(q_emb, emb) / (np.linalg.norm(q_emb) * np.linalg.norm(emb) + 1e-8))
+        sims.append((doc_id, sim))
+    sims.sort(key=lambda x: x[1], reverse=True)
+    return sims[:top_k]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--legacy-queries", type=int, default=3, help="queries timed on the slow legacy loop")
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = rng.normal(size=(args.queries, args.dim))
+    for n in args.sizes:
+        ids = [f"doc-{i}" for i in range(n)]
+        store = VectorStore(dim=args.dim)
+        t0 = time.perf_counter()
+        for start in range(0, n, 65536):
+            chunk = ids[start:start + 65536]
+            store.add_vectors(chunk, rng.normal(size=(len(chunk), args.dim)))
+        t_build = time.perf_counter() - t0
+        # legacy rows hold the same float32 values, one array per document
+        legacy = list(zip(ids, store.matrix))
+
+        t0 = time.perf_counter()
+        expected = [legacy_search(legacy, q, args.top_k) for q in queries[: args.legacy_queries]]
+        t_legacy = (time.perf_counter() - t0) / args.legacy_queries
+        for exp, got in zip(expected, (store.search(q, args.top_k) for q in queries)):
+            assert [d for d, _ in exp] == [d for d, _ in got]
+            assert np.allclose([s for _, s in exp], [s for _, s in got], atol=1e-5)
+        del legacy
+
+        t0 = time.perf_counter()
+        single = [store.search(q, args.top_k) for q in queries]
+        t_single = (time.perf_counter() - t0) / len(queries)
+        t0 = time.perf_counter()
+        batched = store.search_many(list(queries), args.top_k)
+        t_batch = (time.perf_counter() - t0) / len(queries)
+        assert [[d for d, _ in r] for r in single] == [[d for d, _ in r] for r in batched]
+
+        print(f"docs={n:<9,} build {t_build:.2f}s | legacy {t_legacy * 1e3:,.1f}ms/query | "
+              f"search {t_single * 1e3:.2f}ms/query ({t_legacy / t_single:,.0f}x) | "
+              f"search_many({len(queries)}) {t_batch * 1e3:.2f}ms/query ({t_legacy / t_batch:,.0f}x)")
+        del store
+
+
+if __name__ == "__main__":
+    main()
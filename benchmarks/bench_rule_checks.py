@@ -0,0 +1,56 @@
+"""
+Declarative checks (``"checks"`` in logic_rules.json): batched numpy evaluation vs one
+text at a time, as the number of checks grows.
+
+    python benchmarks/bench_rule_checks.py --checks 10 100 1000 --repeat 20
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_logic_engine import load_texts
+from urva.logic.dsl import CheckSet
+
+
+def make_checks(base, n):
+    """``n`` checks cycling through the shipped ones, with distinct names."""
+    return [{**base[i % len(base)], "name": f"{base[i % len(base)]['name']}_{i}"} for i in range(n)]
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="datasets/trap_*.json")
+    parser.add_argument("--rules", default="datasets/logic_rules.json")
+    parser.add_argument("--checks", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--single", type=int, default=1000, help="texts timed one at a time (per-text rate)")
+    args = parser.parse_args()
+
+    with open(args.rules, "r", encoding="utf-8") as f:
+        base = json.load(f)["checks"]
+    texts = load_texts(args.data) * args.repeat
+    for n in args.checks:
+        checks = CheckSet(make_checks(base, n))
+        batched, t_batch = timed(checks.evaluate, texts)
+        subset = texts[: args.single]
+        single, t_single = timed(lambda: [checks.evaluate([t])[0] for t in subset])
+        assert batched[: len(subset)] == single, "batched checks diverged from per-text evaluation"
+        fired = sum(len(v) for v in batched)
+        rate_single = len(subset) / max(t_single, 1e-9)
+        rate_batch = len(texts) / max(t_batch, 1e-9)
+        print(f"checks={n:5d} texts={len(texts)} violations={fired:6d} per-text {rate_single:,.0f} texts/s, "
+              f"batched {rate_batch:,.0f} texts/s ({t_batch:.3f}s) speedup={rate_batch / max(rate_single, 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
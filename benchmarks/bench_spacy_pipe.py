@@ -0,0 +1,58 @@
+"""
+spaCy cost of the logic rules: full vs trimmed model load, and per-text ``nlp(text)``
+calls vs ``LogicEngine.apply_rules_batch`` streaming through ``nlp.pipe``.
+
+    python benchmarks/bench_spacy_pipe.py --repeat 5
+    python benchmarks/bench_spacy_pipe.py --repeat 5 --n-process 1 2 4 --batch-size 64 256
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import spacy
+
+from bench_logic_engine import load_texts
+from urva.logic.engine import DEFAULT_SPACY_COMPONENTS, LogicEngine
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="datasets/trap_*.json")
+    parser.add_argument("--rules", default="datasets/logic_rules.json")
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--n-process", type=int, nargs="+", default=[1])
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[64])
+    args = parser.parse_args()
+
+    full, t_full = timed(spacy.load, args.model)
+    engine = LogicEngine.from_file(args.rules, spacy_model=args.model)
+    trimmed, t_trim = timed(lambda: engine.nlp)
+    print(f"load full    {t_full:.2f}s components={full.pipe_names}")
+    print(f"load trimmed {t_trim:.2f}s components={trimmed.pipe_names}")
+    missing = set(DEFAULT_SPACY_COMPONENTS) - set(trimmed.pipe_names)
+    if missing:
+        print(f"note: model has no {sorted(missing)}")
+
+    texts = load_texts(args.data) * args.repeat
+    expected, t_loop = timed(lambda: [engine.apply_rules(t) for t in texts])
+    print(f"texts={len(texts)} per-text nlp(text) {t_loop:.2f}s ({len(texts) / t_loop:,.0f} texts/s)")
+    for n_process in args.n_process:
+        for batch_size in args.batch_size:
+            got, t_pipe = timed(engine.apply_rules_batch, texts, n_process=n_process, batch_size=batch_size)
+            assert got == expected, "batched violations diverged from per-text calls"
+            print(f"nlp.pipe n_process={n_process} batch_size={batch_size:4d} {t_pipe:.2f}s "
+                  f"({len(texts) / t_pipe:,.0f} texts/s) speedup={t_loop / max(t_pipe, 1e-9):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Dense symmetric eigensolver vs sparse Lanczos (SLQ) estimate of the spectral conflict score.
+
+    python benchmarks/bench_spectral.py --nodes 500 1000 2000 --density 0.01
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from urva.graph.spectral import mean_abs_eigenvalue
+
+
+def random_signed_graph(n, density, seed=0):
+    rng = np.random.default_rng(seed)
+    m = int(density * n * (n - 1) / 2)
+    rows = rng.integers(0, n, size=m)
+    cols = rng.integers(0, n, size=m)
+    keep = rows < cols
+    pairs = np.unique(rows[keep] * n + cols[keep])
+    weights = rng.choice([-1.0, 1.0], size=len(pairs))
+    return pairs // n, pairs % n, weights
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--density", type=float, default=0.01)
+    parser.add_argument("--tol", type=float, default=1e-2)
+    args = parser.parse_args()
+    for n in args.nodes:
+        rows, cols, weights = random_signed_graph(n, args.density)
+        t0 = time.perf_counter()
+        exact = mean_abs_eigenvalue(n, rows, cols, weights, dense_max=n)
+        t_dense = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        approx = mean_abs_eigenvalue(n, rows, cols, weights, dense_max=0, tol=args.tol)
+        t_sparse = time.perf_counter() - t0
+        print(f"n={n:5d} edges={len(weights):7d} dense={exact:.4f} ({t_dense:.3f}s) "
+              f"slq={approx:.4f} ({t_sparse:.3f}s) rel_err={abs(approx - exact) / max(exact, 1e-12):.3%}")
+
+
+if __name__ == "__main__":
+    main()
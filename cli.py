@@ -6,47 +6,89 @@ from urva.models.grounder import FactGrounder
 from urva.models.reasoner import MultiHopReasoner
 from urva.checks.hallucination import HallucinationChecker
 from urva.pipeline.inference import InferencePipeline
+from urva.pipeline.formatting import format_output
+from urva.pipeline.stage_cache import StageCache, hash_file, hash_modules
+from urva.core.checkpoint import load_checkpoint
+from urva.core.quantize import model_nbytes, quantize_module
+from urva.core.export import export_models, load_exported
+from urva.utils.seed import set_seed
 from urva.train.training_loop import Trainer
 from urva.eval.evaluate import Evaluator
 from urva.eval.metrics import compute_metrics, summarize
 from urva.data import benchmarks
 from urva.eval.baseline_compare import compare_urva_vs_gpt
-
-
-def format_output(out):
-    lines = [
-        f"Final Answer: {out.get('final_answer','')}",
-        f"Summary: {out.get('summary','')}",
-        f"Certainty: {out['fusion'].get('certainty',0):.3f}",
-        f"Reasoning Confidence: {out['fusion'].get('reasoning_alignment',0):.3f}",
-        f"Conflict Score: {out['fusion'].get('conflict_score',0):.3f}",
-        f"Logic Violations: {len(out.get('hallucination',{}).get('violations',[]))}",
-        f"Hallucination Type: {out.get('hallucination',{}).get('type','NONE')}",
-    ]
-    return "\n".join(lines)
+from urva.eval.parallel import ParallelRunner
+from urva.serve.server import AuditServer
 
 
 def main():
     parser = argparse.ArgumentParser(description="URVA Beast-Mode CLI")
     parser.add_argument("--config", type=str, default=None, help="Path to JSON config")
-    parser.add_argument("--mode", type=str, choices=["train", "eval", "infer", "bench", "baseline"], default="infer")
+    parser.add_argument("--mode", type=str, choices=["train", "eval", "infer", "bench", "baseline", "serve", "export"], default="infer")
     parser.add_argument("--speed", type=str, choices=["aggressive", "balanced", "deep"], default="balanced")
-    parser.add_argument("--data", type=str, required=True, help="Path to dataset file (jsonl or json array)")
+    parser.add_argument("--data", type=str, default=None, help="Path to dataset file (jsonl or json array)")
     parser.add_argument("--benchmark", type=str, choices=["truthfulqa_mc", "truthfulqa_gen", "hotpot"], help="Benchmark selection for bench/baseline modes")
     parser.add_argument("--logic", type=str, default="logic_rules.json", help="Path to logic rules JSON")
     parser.add_argument("--checkpoint", type=str, default=None, help="Path to model checkpoint")
     parser.add_argument("--text", type=str, help="Ad-hoc inference text")
+    parser.add_argument("--cache", type=str, default=None, help="Directory for the persistent stage cache")
     parser.add_argument("--debug", action="store_true", help="Include debug tensors/objects")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for eval/bench/baseline modes")
+    parser.add_argument("--host", type=str, default=None, help="Bind address for serve mode")
+    parser.add_argument("--port", type=int, default=None, help="TCP port for serve mode")
+    parser.add_argument("--socket", type=str, default=None, help="Unix socket path for serve mode (overrides host/port)")
+    parser.add_argument("--max-batch", type=int, default=None, help="Micro-batch size limit for serve mode")
+    parser.add_argument("--max-wait-ms", type=float, default=None, help="Micro-batch collection window for serve mode")
+    parser.add_argument("--scripted", type=str, default=None, help="TorchScript artifact: written by export mode, used instead of the eager grounder/reasoner otherwise")
+    parser.add_argument("--quantize", type=str, choices=["int8"], default=None, help="Dynamic CPU quantization of the grounder/reasoner for inference")
     parser.add_argument("--ablation", type=str, choices=["grounder", "reasoner", "logic", "refiner"], help="Remove a component for ablation")
     args = parser.parse_args()
 
     cfg = load_config(args.config)
-    loader = DatasetLoader(args.data, cfg)
-    logic = LogicEngine.from_file(args.logic)
+    if args.workers:
+        cfg["workers"] = args.workers
+    if args.quantize:
+        if args.mode == "train":
+            raise SystemExit("--quantize is inference-only")
+        cfg["quantize"] = args.quantize
+    if args.mode == "train" and args.scripted:
+        raise SystemExit("--scripted is inference-only")
+    if args.mode == "export" and not args.scripted:
+        raise SystemExit("Specify --scripted output path for export mode")
+    if args.data is None and not (args.mode in ("serve", "export") or (args.mode == "infer" and args.text)):
+        raise SystemExit(f"Specify --data for {args.mode} mode")
+    loader = DatasetLoader(args.data, cfg) if args.data else None
+    set_seed(cfg.get("seed", 42))
+    logic = LogicEngine.from_file(args.logic, **cfg.get("logic", {}))
     grounder = FactGrounder(cfg)
     reasoner = MultiHopReasoner(cfg)
+    if args.checkpoint:
+        state = load_checkpoint(args.checkpoint)
+        grounder.load_state_dict(state["grounder"])
+        reasoner.load_state_dict(state["reasoner"])
     checker = HallucinationChecker(logic, conflict_threshold=cfg.get("graph", {}).get("conflict_threshold", 0.25))
-    pipeline = InferencePipeline(grounder, reasoner, checker, cfg, logic)
+    cache = None
+    cache_dir = args.cache or cfg.get("cache", {}).get("path")
+    if cache_dir:
+        if args.scripted and args.mode != "export":
+            # the artifact's weights are what runs; the eager modules only supply config/tokenization
+            ckpt_hash = hash_file(args.scripted)
+        else:
+            ckpt_hash = hash_file(args.checkpoint) if args.checkpoint else hash_modules([grounder, reasoner])
+        cache = StageCache(cache_dir, max_bytes=cfg.get("cache", {}).get("max_bytes", 1 << 30), checkpoint_hash=ckpt_hash)
+    if args.quantize:
+        before = model_nbytes(grounder) + model_nbytes(reasoner)
+        quantize_module(grounder, args.quantize)
+        quantize_module(reasoner, args.quantize)
+        after = model_nbytes(grounder) + model_nbytes(reasoner)
+        print(f"Quantized grounder/reasoner to {args.quantize}: {before / 1e6:.2f}MB -> {after / 1e6:.2f}MB")
+    if args.mode == "export":
+        export_models(grounder, reasoner, args.scripted, meta={"quantize": args.quantize})
+        print(f"Exported scripted grounder/reasoner cores to {args.scripted}")
+        return
+    if args.scripted:
+        grounder, reasoner = load_exported(args.scripted, grounder, reasoner)
+    pipeline = InferencePipeline(grounder, reasoner, checker, cfg, logic, cache=cache)
     if args.ablation:
         print(f"Ablation active: {args.ablation} removed")
 
@@ -56,6 +98,17 @@ def main():
     elif args.mode == "eval":
         evaluator = Evaluator(cfg, pipeline)
         evaluator.run(loader)
+    elif args.mode == "serve":
+        serve_cfg = cfg.get("serve", {})
+        server = AuditServer(
+            pipeline,
+            max_batch=args.max_batch or serve_cfg.get("max_batch", 16),
+            max_wait_ms=args.max_wait_ms if args.max_wait_ms is not None else serve_cfg.get("max_wait_ms", 5.0),
+            host=args.host or serve_cfg.get("host", "127.0.0.1"),
+            port=args.port or serve_cfg.get("port", 8080),
+            unix_socket=args.socket,
+        )
+        server.run()
     elif args.mode == "bench":
         if not args.benchmark:
             raise SystemExit("Specify --benchmark for bench mode")
@@ -65,7 +118,8 @@ def main():
             dataset = benchmarks.load_truthfulqa_gen(args.data)
         else:
             dataset = benchmarks.load_hotpot(args.data)
-        outputs = [pipeline.run(sample, speed=args.speed, ablation=args.ablation) for sample in dataset]
+        runner = ParallelRunner(pipeline, workers=cfg["workers"], batch_size=cfg["batch_size"])
+        outputs = runner.run(dataset, speed=args.speed, ablation=args.ablation)
         metrics = compute_metrics(outputs)
         print(summarize(metrics))
     elif args.mode == "baseline":
@@ -77,7 +131,8 @@ def main():
             dataset = benchmarks.load_truthfulqa_gen(args.data)
         else:
             dataset = benchmarks.load_hotpot(args.data)
-        summary = compare_urva_vs_gpt(dataset, pipeline, logic, cfg, speed=args.speed, ablation=args.ablation)
+        summary = compare_urva_vs_gpt(dataset, pipeline, logic, cfg, speed=args.speed, ablation=args.ablation,
+                                      workers=cfg["workers"])
         urva_acc = summary["urva_metrics"]["accuracy"]
         gpt_acc = summary["gpt_metrics"]["accuracy"]
         print(
@@ -92,9 +147,11 @@ def main():
             output = pipeline.run(sample, speed=args.speed, debug=args.debug, ablation=args.ablation)
             print(format_output(output))
         else:
-            for sample in loader:
-                out = pipeline.run(sample, speed=args.speed, debug=args.debug, ablation=args.ablation)
-                print(format_output(out))
+            for batch in loader.batched():
+                for out in pipeline.run_batch(batch, speed=args.speed, debug=args.debug, ablation=args.ablation):
+                    print(format_output(out))
+    if cache is not None:
+        cache.close()
 
 
 if __name__ == "__main__":
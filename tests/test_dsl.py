@@ -0,0 +1,75 @@
+import datetime
+import json
+from pathlib import Path
+
+import pytest
+
+from urva.logic.dsl import CheckSet
+
+TODAY = datetime.date(2024, 6, 1)
+
+
+@pytest.fixture(scope="module")
+def checks():
+    rules = json.loads((Path(__file__).resolve().parents[1] / "logic_rules.json").read_text(encoding="utf-8"))
+    return CheckSet(rules["checks"])
+
+
+def _fired(checks, text):
+    return [v["rule"] for v in checks.evaluate([text], today=TODAY)[0]]
+
+
+@pytest.mark.parametrize("text", [
+    "He was 2500 meters away from the camp.",
+    "The building was 2100 feet tall.",
+    "The expedition was 2800 kilometres long.",
+    "By 2100 meters the trail was steep.",
+    "The festival was founded in 1990.",
+    "She was born in 2024.",
+])
+def test_numbers_that_are_not_future_years(checks, text):
+    assert "FutureDate" not in _fired(checks, text)
+
+
+@pytest.mark.parametrize("text", [
+    "The bridge was built in 2150.",
+    "She was born in March 2999 in Paris.",
+    "It happened on July 4, 2400 when the colony fell.",
+    "The company was founded since 2090 and grew.",
+    "The treaty was signed on 2030-01-01.",
+])
+def test_future_years_and_dates(checks, text):
+    assert "FutureDate" in _fired(checks, text)
+
+
+def test_batch_matches_single_texts(checks):
+    texts = ["He was 2500 meters away from the camp.", "The bridge was built in 2150.", "Nothing here."]
+    batch = checks.evaluate(texts, today=TODAY)
+    assert batch == [checks.evaluate([t], today=TODAY)[0] for t in texts]
+
+
+@pytest.fixture(scope="module")
+def dataset_checks():
+    path = Path(__file__).resolve().parents[1] / "datasets" / "logic_rules.json"
+    return CheckSet(json.loads(path.read_text(encoding="utf-8"))["checks"])
+
+
+@pytest.mark.parametrize("text, rule", [
+    ("The probability of rain in 2024 was 0.3.", "ProbabilityRange"),
+    ("The temperature dropped to -5 C and the distance was 10 km.", "NegativeDistance"),
+])
+def test_values_outside_a_checks_unit_do_not_fire(checks, text, rule):
+    assert rule not in _fired(checks, text)
+
+
+def test_percentages_are_not_counts(dataset_checks):
+    fired = _fired(dataset_checks, "The population grew by -2% last year.")
+    assert fired == ["PercentageRange"]
+
+
+@pytest.mark.parametrize("text", [
+    "The camp was -3 km away from the river.",
+    "The distance was -200 meters.",
+])
+def test_negative_distances(checks, text):
+    assert "NegativeDistance" in _fired(checks, text)
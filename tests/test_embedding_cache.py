@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from urva.models.embedding_cache import EmbeddingCache
+
+TEXTS = ["the sky is blue", "water boils at 100 C", "whales are mammals"]
+
+
+def test_switching_models_does_not_reuse_vectors(tmp_path):
+    old = np.random.default_rng(0).normal(size=(3, 4)).astype(np.float32)
+    EmbeddingCache(path=str(tmp_path), model="model-a").put_many(TEXTS, old)
+
+    other = EmbeddingCache(path=str(tmp_path), model="model-b")
+    assert other.get_many(TEXTS) == [None, None, None]
+    new = np.random.default_rng(1).normal(size=(3, 8)).astype(np.float32)
+    other.put_many(TEXTS, new)
+    assert other.dim == 8
+
+    reopened = EmbeddingCache(path=str(tmp_path), model="model-a").get_many(TEXTS)
+    np.testing.assert_array_equal(np.stack(reopened), old)
+    reopened = EmbeddingCache(path=str(tmp_path), model="model-b").get_many(TEXTS)
+    np.testing.assert_array_equal(np.stack(reopened), new)
+
+
+def test_dim_mismatch_for_the_same_model_is_rejected(tmp_path):
+    EmbeddingCache(path=str(tmp_path), model="model-a").put_many(TEXTS[:1], np.ones((1, 4), dtype=np.float32))
+    with pytest.raises(ValueError):
+        EmbeddingCache(path=str(tmp_path), model="model-a").put_many(TEXTS[1:], np.ones((2, 8), dtype=np.float32))
@@ -0,0 +1,23 @@
+import pytest
+import torch
+
+from urva.config import DEFAULT_CONFIG
+from urva.models.grounder import FactGrounder
+
+
+@pytest.fixture(scope="module")
+def grounder():
+    torch.manual_seed(0)
+    return FactGrounder(DEFAULT_CONFIG)
+
+
+def test_token_ids_above_255_are_kept(grounder):
+    tokens = [300, 70000, 5, -2] * 20
+    facts = grounder.ground_tokens(tokens)["grounded_facts"]
+    assert len(facts)
+    assert [f["token"] for f in facts] == [tokens[p] for p in facts.positions.tolist()]
+
+
+def test_token_ids_outside_int32_are_rejected(grounder):
+    with pytest.raises(ValueError):
+        grounder.ground_tokens([1, 2 ** 40])
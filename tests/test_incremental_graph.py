@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from urva.graph.contradiction import ContradictionGraph
+from urva.reasoning.conflict_graph import ConflictGraph
+from urva.reasoning.incremental_graph import IncrementalConflictGraph
+
+STREAM = [
+    "The river is wide",
+    "The river is not wide",
+    "The river is wide",
+    "   ",
+    "Whales are mammals",
+    "Whales are not mammals. The bridge was built in 1990",
+    "The river is wide",
+    "No whales are mammals",
+    "The bridge was built in 1990",
+]
+
+
+def _assert_same_graph(got, want):
+    for key in ("contradictions", "confirmations", "total_relations"):
+        assert got[key] == want[key]
+    assert got["spectral"] == pytest.approx(want["spectral"], abs=1e-9)
+    assert got["conflict_score"] == pytest.approx(want["conflict_score"], abs=1e-9)
+    assert got["edges"].to_dicts() == want["edges"].to_dicts()
+
+
+def test_incremental_graph_matches_a_rebuild_after_every_step():
+    graph = IncrementalConflictGraph()
+    for step in STREAM:
+        if "." in step:
+            graph.add_text(step)
+        else:
+            graph.add_sentence(step)
+        assert graph.status()["conflict_score"] == pytest.approx(
+            ConflictGraph().build(graph.sentences)["contradictions"] / graph.total_relations
+        )
+        _assert_same_graph(graph.snapshot(), ConflictGraph().build(graph.sentences))
+
+        got, want = graph.contradiction_result(), ContradictionGraph().build(graph.sentences)
+        assert (got.contradictions, got.confirmations, got.total_relations) == (
+            want.contradictions, want.confirmations, want.total_relations)
+        assert got.conflict_score == pytest.approx(want.conflict_score)
+        assert got.edges.to_dicts() == want.edges.to_dicts()
+
+    assert len(graph) == 9
+    snapshot = graph.snapshot()
+    assert snapshot["confirmations"] > 0
+    assert graph.contradiction_result().contradictions > 0
+    assert np.isfinite(snapshot["spectral"])
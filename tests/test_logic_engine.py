@@ -0,0 +1,29 @@
+import datetime
+from pathlib import Path
+
+from urva.logic.engine import LogicEngine
+
+RULES = Path(__file__).resolve().parents[1] / "logic_rules.json"
+
+
+def test_date_checks_are_not_reused_across_days(monkeypatch):
+    engine = LogicEngine.from_file(str(RULES), spacy_model=None)
+    text = "The bridge was built in 2030."
+    day = {"today": datetime.date(2029, 12, 31)}
+    monkeypatch.setattr(engine, "evaluation_date", lambda: day["today"])
+
+    before = engine.apply_rules(text)
+    identity_before = engine.cache_identity()
+    day["today"] = datetime.date(2030, 6, 1)
+    after = engine.apply_rules(text)
+
+    assert "FutureDate" in [v["rule"] for v in before]
+    assert "FutureDate" not in [v["rule"] for v in after]
+    assert engine.cache_identity() != identity_before
+    assert engine.apply_rules_batch([text]) == [after]
+
+
+def test_date_free_checks_do_not_key_on_date():
+    engine = LogicEngine({"checks": []}, spacy_model=None)
+    assert engine.evaluation_date() is None
+    assert engine.cache_identity()["date"] is None
@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from urva.checks.hallucination import HallucinationChecker
+from urva.config import DEFAULT_CONFIG
+from urva.core.quantize import compare_outputs, quantize_module
+from urva.logic.engine import LogicEngine
+from urva.models.grounder import FactGrounder
+from urva.models.reasoner import MultiHopReasoner
+from urva.pipeline.inference import InferencePipeline
+from urva.utils.seed import set_seed
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _trap_items(limit):
+    raw = (ROOT / "datasets" / "trap_1.json").read_bytes()
+    try:
+        entries = json.loads(raw.decode("utf-8"))
+    except UnicodeDecodeError:
+        entries = json.loads(raw.decode("cp1252"))
+    texts = [e.get("text") or e.get("claim") for e in entries]
+    return [{"id": i, "text": t} for i, t in enumerate(texts) if t][:limit]
+
+
+def _pipeline(cfg=DEFAULT_CONFIG):
+    set_seed(DEFAULT_CONFIG["seed"])
+    logic = LogicEngine.from_file(str(ROOT / "logic_rules.json"), spacy_model=None)
+    return InferencePipeline(FactGrounder(DEFAULT_CONFIG), MultiHopReasoner(DEFAULT_CONFIG),
+                             HallucinationChecker(logic), cfg, logic)
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return _pipeline()
+
+
+@pytest.mark.parametrize("batch_size", [8, 32])
+def test_run_batch_matches_run(pipeline, batch_size):
+    items = _trap_items(64)
+    tol = InferencePipeline.BATCH_TOLERANCE
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        for got, item in zip(pipeline.run_batch(batch), batch):
+            want = pipeline.run(item)
+            assert (got.S1, got.S2, got.S3) == (want.S1, want.S2, want.S3)
+            assert (got.final_answer, got.summary, got.evidence) == (want.final_answer, want.summary, want.evidence)
+            assert got.hallucination == want.hallucination
+            assert got.rule_violations == want.rule_violations
+            assert got.final_score == pytest.approx(want.final_score, abs=tol)
+            assert got.certainty == pytest.approx(want.certainty, abs=tol)
+            assert got.hop_scores == pytest.approx(want.hop_scores, abs=tol)
+            assert got.conflict_score == pytest.approx(want.conflict_score, abs=tol)
+
+
+def test_quantized_outputs_match_fp32():
+    items = _trap_items(48)
+    fp32 = _pipeline()
+    reference = [result.to_dict() for result in fp32.run_batch(items)]
+    quantize_module(fp32.grounder)
+    quantize_module(fp32.reasoner)
+    int8 = InferencePipeline(fp32.grounder, fp32.reasoner, fp32.checker,
+                             {**DEFAULT_CONFIG, "quantize": "int8"}, fp32.logic)
+    report = compare_outputs(reference, [result.to_dict() for result in int8.run_batch(items)])
+    assert report["items"] == len(items)
+    assert report["passed"], report
+
+
+def test_result_score_tensor_is_built_once(pipeline):
+    result = pipeline.run(_trap_items(1)[0])
+    tensor = result["states"]["score_tensor"]
+    assert result["reasoning"]["score_tensor"] is tensor
+    assert result.to_dict()["states"]["score_tensor"] is tensor
+    assert tensor.item() == pytest.approx(result.final_score)
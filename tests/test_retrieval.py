@@ -0,0 +1,73 @@
+import multiprocessing as mp
+
+import numpy as np
+import pytest
+
+from urva.utils.retrieval import VectorStore
+
+
+def _docs(prefix, n):
+    return [(f"{prefix}-{i}", f"{prefix} text {i}") for i in range(n)]
+
+
+def test_save_open_append_reopen(tmp_path):
+    path = str(tmp_path / "index")
+    store = VectorStore(dim=16)
+    store.add_many(_docs("base", 40) + [("ünïcode", "unicode id")])
+    store.save(path)
+
+    a, b = VectorStore.open(path), VectorStore.open(path)
+    assert isinstance(a.matrix, np.memmap)
+    assert list(a.ids) == store.ids
+    assert a.search("base text 3", 3) == store.search("base text 3", 3)
+
+    # two handles append in turn; each append starts from the committed size
+    a.add_many(_docs("a", 5))
+    b.add_many(_docs("b", 7))
+    a.add("a-last", "a text last")
+
+    reopened = VectorStore.open(path)
+    ids = list(reopened.ids)
+    assert len(reopened) == 41 + 5 + 7 + 1
+    assert ids[:41] == store.ids
+    assert sorted(ids[41:]) == sorted([d for d, _ in _docs("a", 5) + _docs("b", 7)] + ["a-last"])
+    assert ids[40] == "ünïcode"
+    assert reopened.search("b text 4", 1)[0][0] == "b-4"
+    assert reopened.search_many(["a text 2", "base text 7"], 1) == [
+        [reopened.search("a text 2", 1)[0]], [reopened.search("base text 7", 1)[0]]]
+
+    loaded = VectorStore.open(path, mmap=False)
+    assert loaded.path is None and loaded.ids == ids
+    assert np.array_equal(loaded.matrix, reopened.matrix)
+    loaded.add("memory-only", "x")
+    assert len(VectorStore.open(path)) == len(reopened)
+
+
+def test_empty_index_round_trip(tmp_path):
+    path = str(tmp_path / "empty")
+    VectorStore(dim=8).save(path)
+    store = VectorStore.open(path)
+    assert len(store) == 0 and store.search("anything") == []
+    store.add("first", "first text")
+    assert VectorStore.open(path).search("first text", 1)[0][0] == "first"
+
+
+def _append_worker(path, prefix):
+    VectorStore.open(path).add_many(_docs(prefix, 25))
+
+
+@pytest.mark.skipif("fork" not in mp.get_all_start_methods(), reason="needs fork")
+def test_concurrent_appends_from_processes(tmp_path):
+    path = str(tmp_path / "shared")
+    VectorStore(dim=16).save(path)
+    ctx = mp.get_context("fork")
+    procs = [ctx.Process(target=_append_worker, args=(path, f"w{k}")) for k in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+    store = VectorStore.open(path)
+    assert len(store) == 100 and len(set(store.ids)) == 100
+    for k in range(4):
+        assert store.search(f"w{k} text 9", 1)[0][0] == f"w{k}-9"
@@ -0,0 +1,12 @@
+import os
+
+from urva.models.sbert import load_sbert, sbert_stats
+
+
+def test_offline_without_local_model_falls_back_without_touching_env(tmp_path):
+    before = dict(os.environ)
+    missing = str(tmp_path / "no-such-model")
+    assert load_sbert("no-such-model", path=missing, offline=True) is None
+    assert dict(os.environ) == before
+    stats = sbert_stats()[f"no-such-model|{missing}|True|None"]
+    assert stats["error"].startswith("FileNotFoundError")
@@ -0,0 +1,59 @@
+from urva.pipeline.stage_cache import StageCache
+
+
+def _stored_bytes(cache):
+    return cache.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+
+def test_resume_from_reopened_cache(tmp_path):
+    cache = StageCache(str(tmp_path))
+    keys = [cache.key("reasoner", f"text {i}", "cfg") for i in range(20)]
+    for i, key in enumerate(keys):
+        cache.put(key, "reasoner", {"i": i})
+    assert cache.get(keys[3]) == {"i": 3}
+    cache.close()
+
+    resumed = StageCache(str(tmp_path))
+    assert [resumed.get(key) for key in keys] == [{"i": i} for i in range(20)]
+    assert resumed.get(resumed.key("reasoner", "unseen", "cfg")) is StageCache.MISS
+    assert resumed.stats()["entries"] == 20
+    assert resumed._total == _stored_bytes(resumed)
+
+
+def test_evicts_least_recently_used_within_budget(tmp_path):
+    payload = "x" * 1000
+    cache = StageCache(str(tmp_path), max_bytes=20_000)
+    for i in range(15):
+        cache.put(f"k{i}", "s", payload)
+    # a hit makes k0 the most recently used; its access time is written back on the next put
+    assert cache.get("k0") == payload
+    for i in range(15, 23):
+        cache.put(f"k{i}", "s", payload)
+
+    stats = cache.stats()
+    assert 0 < stats["bytes"] <= cache.max_bytes
+    assert cache._total == _stored_bytes(cache) == stats["bytes"]
+    assert cache.get("k0") == payload
+    assert cache.get("k1") is StageCache.MISS
+    assert cache.get("k22") == payload
+
+
+def test_replace_keeps_byte_total(tmp_path):
+    cache = StageCache(str(tmp_path))
+    cache.put("k", "s", "a" * 100)
+    cache.put("k", "s", "b" * 10)
+    cache.put("other", "s", "c")
+    assert cache._total == _stored_bytes(cache)
+    cache.clear()
+    assert cache._total == 0 and cache.stats()["entries"] == 0
+
+
+def test_access_times_are_batched(tmp_path):
+    cache = StageCache(str(tmp_path))
+    cache.put("k", "s", 1)
+    before = cache.conn.total_changes
+    for _ in range(StageCache.TOUCH_BATCH - 1):
+        cache.get("k")
+    assert cache.conn.total_changes == before
+    cache.get("k")
+    assert cache.conn.total_changes == before + 1
@@ -14,4 +14,5 @@ __all__ = [
     "refiner",
     "modes",
     "utils",
+    "serve",
 ]
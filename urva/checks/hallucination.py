@@ -1,5 +1,5 @@
 # urva/checks/hallucination.py 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from urva.logic.engine import LogicEngine
 
 
@@ -16,14 +16,17 @@ class HallucinationChecker:
             violations.extend(v)
         return {"violations": violations, "has_hallucination": len(violations) > 0}
 
-    def run_all(self, states: Dict[str, str], conflict_score: float = 0.0) -> Dict[str, Any]:
-        violations: List[Dict[str, Any]] = []
-        for key in ["S1", "S2", "S3"]:
-            text = states.get(key) or ""
-            if not text:
-                continue
-            v = self.engine.apply_rules(text)
-            violations.extend(v)
+    def run_all(self, states: Dict[str, str], conflict_score: float = 0.0,
+                violations: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        # callers that already ran the rules over these states (StateAnalysis) pass them in
+        if violations is None:
+            violations = []
+            for key in ["S1", "S2", "S3"]:
+                text = states.get(key) or ""
+                if not text:
+                    continue
+                v = self.engine.apply_rules(text)
+                violations.extend(v)
 
         has_conflict = conflict_score > self.conflict_threshold
 
@@ -6,16 +6,41 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "seed": 42,
     "device": "cpu",
     "batch_size": 8,
+    "workers": 1,
     "num_epochs": 1,
     "learning_rate": 1e-3,
     "hidden_size": 128,
     "dropout": 0.1,
     "max_hops": 3,
-    "grounder": {"threshold": 0.5},
-    "reasoner": {"max_depth": 3},
+    "grounder": {
+        "threshold": 0.5,
+        "encode_batch_size": 64,
+        "window": None,
+        "max_length": None,
+        "embedding_cache": {"max_entries": 65536, "path": None, "disk_capacity": 1000000},
+        "sbert": {"model": "all-MiniLM-L6-v2", "path": None, "offline": False, "device": None},
+    },
+    "reasoner": {"max_depth": 3, "max_context": 4096},
     "checker": {"max_violations": 3},
-    "graph": {"conflict_threshold": 0.25},
+    "graph": {
+        "conflict_threshold": 0.25,
+        "approximate": False,
+        "approx_min_sentences": 256,
+        "lsh_recall": 0.95,
+        "lsh_max_bands": 32,
+        "approx_sample": 4096,
+    },
+    "logic": {
+        "spacy_model": "en_core_web_sm",
+        "spacy_components": ["tok2vec", "tagger", "attribute_ruler", "parser", "ner"],
+        "n_process": 1,
+        "batch_size": 64,
+        "memo_size": 4096,
+    },
+    "self_consistency": {"enabled": False, "k": 4, "noise": 0.1, "speeds": ["deep"]},
     "refine_loops": {"aggressive": 2, "smart": 1, "turbo": 0},
+    "cache": {"path": None, "max_bytes": 1 << 30},
+    "serve": {"host": "127.0.0.1", "port": 8080, "max_batch": 16, "max_wait_ms": 5.0},
 }
 
 
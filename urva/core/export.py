@@ -0,0 +1,87 @@
+"""
+TorchScript export of the grounder/reasoner tensor cores for low-latency CPU serving.
+
+Only ``GrounderCore`` and ``ReasonerCore`` are scripted; text encoding and template
+choice stay in Python on the eager modules. ``load_exported`` wraps the artifact so the
+pipeline uses it in place of the eager modules.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from torch import nn
+
+from urva.models.grounder import FactGrounder, GrounderCore
+from urva.models.reasoner import MultiHopReasoner, ReasonerCore
+
+_META_FILE = "urva.json"
+
+
+class ExportedCores(nn.Module):
+    def __init__(self, grounder: FactGrounder, reasoner: MultiHopReasoner):
+        super().__init__()
+        self.grounder = GrounderCore(grounder)
+        self.reasoner = ReasonerCore(reasoner)
+
+    def forward(self, emb: torch.Tensor, mask: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        return self.reasoner(emb, mask)
+
+
+def export_models(grounder: FactGrounder, reasoner: MultiHopReasoner, path: str,
+                  meta: Optional[Dict[str, Any]] = None) -> str:
+    grounder.eval()
+    reasoner.eval()
+    scripted = torch.jit.script(ExportedCores(grounder, reasoner))
+    meta = {"hidden_size": reasoner.hidden, **(meta or {})}
+    torch.jit.save(scripted, path, _extra_files={_META_FILE: json.dumps(meta)})
+    return path
+
+
+class _Exported:
+    """Delegates everything but the tensor core to the wrapped eager module."""
+
+    def __init__(self, model: nn.Module, module: torch.jit.ScriptModule):
+        self.model = model
+        self.module = module
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("model", "module"):
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+
+class ExportedGrounder(_Exported):
+    def ground_tokens_batch(self, token_lists) -> List[Dict[str, Any]]:
+        return self.model.ground_tokens_batch(token_lists, core=self.module.grounder)
+
+    def ground_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        return self.ground_tokens_batch([self.model._tokenize(t) for t in texts])
+
+    def __call__(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        return self.ground_batch([batch.get("text", "")])[0]
+
+
+class ExportedReasoner(_Exported):
+    def forward_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        return self.model.forward_batch(texts, core=self.module.reasoner)
+
+    def forward_candidates(self, text: str, k: int, noise: float) -> List[Dict[str, Any]]:
+        return self.model.forward_candidates(text, k, noise, core=self.module.reasoner)
+
+    def __call__(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        return self.forward_batch([batch.get("text", "")])[0]
+
+
+def load_exported(path: str, grounder: FactGrounder,
+                  reasoner: MultiHopReasoner) -> Tuple[ExportedGrounder, ExportedReasoner]:
+    """
+    Load an artifact written by ``export_models``. ``grounder``/``reasoner`` supply the
+    config, tokenization and template banks; their weights are not used.
+    """
+    extra = {_META_FILE: ""}
+    module = torch.jit.load(path, map_location="cpu", _extra_files=extra)
+    meta = json.loads(extra[_META_FILE] or "{}")
+    if meta.get("hidden_size", reasoner.hidden) != reasoner.hidden:
+        raise ValueError(f"{path} was exported with hidden_size={meta['hidden_size']}, config has {reasoner.hidden}")
+    module.eval()
+    return ExportedGrounder(grounder, module), ExportedReasoner(reasoner, module)
@@ -0,0 +1,56 @@
+"""
+CPU int8 dynamic quantization for serving.
+
+``nn.GRU`` and ``nn.Linear`` weights are stored as int8 and activations are quantized
+on the fly per batch, so no calibration data is needed. Applied in place after the
+checkpoint loads; the quantized modules are inference-only.
+"""
+import io
+from typing import Any, Dict, List, Sequence
+
+import torch
+from torch import nn
+
+QUANTIZE_MODES = ("int8",)
+
+
+def quantize_module(module: nn.Module, mode: str = "int8") -> nn.Module:
+    if mode not in QUANTIZE_MODES:
+        raise ValueError(f"Unsupported quantization mode: {mode}")
+    module.eval()
+    return torch.ao.quantization.quantize_dynamic(module, {nn.GRU, nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def model_nbytes(module: nn.Module) -> int:
+    """Serialized size of the state dict; counts packed int8 weights, which ``parameters()`` does not."""
+    buf = io.BytesIO()
+    torch.save(module.state_dict(), buf)
+    return buf.tell()
+
+
+def compare_outputs(reference: Sequence[Dict[str, Any]], candidate: Sequence[Dict[str, Any]],
+                    certainty_tol: float = 0.05, max_drift_rate: float = 0.01) -> Dict[str, Any]:
+    """
+    Regression check of quantized vs fp32 pipeline outputs. An item drifts when its
+    certainty moves by more than ``certainty_tol`` or its hallucination verdict (flag
+    and type) changes; a quantized template pick can flip near a bucket edge, so the
+    check bounds the share of drifting items rather than demanding none.
+    """
+    gaps: List[float] = []
+    flipped = drifted = 0
+    for ref, out in zip(reference, candidate):
+        gap = abs(ref["fusion"]["certainty"] - out["fusion"]["certainty"])
+        r, o = ref["hallucination"], out["hallucination"]
+        flip = (r["has_hallucination"], r["type"]) != (o["has_hallucination"], o["type"])
+        gaps.append(gap)
+        flipped += flip
+        drifted += flip or gap > certainty_tol
+    n = max(len(gaps), 1)
+    return {
+        "items": len(gaps),
+        "max_certainty_gap": max(gaps, default=0.0),
+        "mean_certainty_gap": sum(gaps) / n,
+        "verdict_flip_rate": flipped / n,
+        "drift_rate": drifted / n,
+        "passed": drifted / n <= max_drift_rate,
+    }
@@ -1,7 +1,18 @@
 import json
 import random
 from pathlib import Path
-from typing import Any, Dict, Iterator, List
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+def iter_batches(items: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 class DatasetLoader:
@@ -35,12 +46,4 @@ class DatasetLoader:
                 yield json.loads(line)
 
     def batched(self, batch_size: int | None = None) -> Iterator[List[Dict[str, Any]]]:
-        batch: List[Dict[str, Any]] = []
-        bsz = batch_size or self.cfg["batch_size"]
-        for item in self:
-            batch.append(item)
-            if len(batch) >= bsz:
-                yield batch
-                batch = []
-        if batch:
-            yield batch
+        yield from iter_batches(self, batch_size or self.cfg["batch_size"])
@@ -1,6 +1,7 @@
 from typing import List, Dict, Any
 from urva.eval.metrics import compute_metrics
 from urva.baselines.gpt_baseline import run_gpt_baseline
+from urva.eval.parallel import ParallelRunner
 
 
 def _evaluate_baseline(dataset: List[Dict[str, Any]], logic) -> List[Dict[str, Any]]:
@@ -20,10 +21,10 @@ def _evaluate_baseline(dataset: List[Dict[str, Any]], logic) -> List[Dict[str, A
     return outputs
 
 
-def compare_urva_vs_gpt(dataset: List[Dict[str, Any]], urva_pipeline, logic, cfg, speed: str = "balanced", ablation=None):
-    urva_outputs = []
-    for sample in dataset:
-        urva_outputs.append(urva_pipeline.run(sample, speed=speed, ablation=ablation))
+def compare_urva_vs_gpt(dataset: List[Dict[str, Any]], urva_pipeline, logic, cfg, speed: str = "balanced", ablation=None,
+                        workers: int = 1):
+    runner = ParallelRunner(urva_pipeline, workers=workers, batch_size=cfg.get("batch_size", 8))
+    urva_outputs = runner.run(dataset, speed=speed, ablation=ablation)
 
     gpt_outputs = _evaluate_baseline(dataset, logic)
 
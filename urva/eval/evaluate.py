@@ -6,6 +6,7 @@ from tqdm import tqdm
 import numpy as np
 
 from urva.eval.metrics import compute_metrics, summarize
+from urva.eval.parallel import ParallelRunner
 
 
 class Evaluator:
@@ -13,11 +14,18 @@ class Evaluator:
         self.cfg = cfg
         self.pipeline = pipeline
 
-    def run(self, loader, speed: str = "balanced"):
+    def run(self, loader, speed: str = "balanced", workers: int | None = None):
         outputs = []
-        for sample in tqdm(loader, desc="Eval"):
-            out = self.pipeline.run(sample, speed=speed)
-            outputs.append(out)
+        workers = workers or self.cfg.get("workers", 1)
+        if workers > 1:
+            runner = ParallelRunner(self.pipeline, workers=workers, batch_size=self.cfg["batch_size"])
+            batches = runner.imap(list(loader), speed=speed)
+        else:
+            batches = (self.pipeline.run_batch(batch, speed=speed) for batch in loader.batched())
+        with tqdm(desc="Eval") as pbar:
+            for outs in batches:
+                outputs.extend(outs)
+                pbar.update(len(outs))
         metrics = compute_metrics(outputs)
         print(summarize(metrics))
         return metrics
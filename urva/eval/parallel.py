@@ -0,0 +1,87 @@
+"""
+Process-pool execution of the inference pipeline for large evaluation runs.
+"""
+import multiprocessing as mp
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+import torch
+
+from urva.data.loader import iter_batches
+from urva.utils.device import detach_tree
+
+_WORKER_PIPELINE = None
+
+
+def _init_worker(pipeline, num_threads: int) -> None:
+    global _WORKER_PIPELINE
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # interop pool already started in this process
+        pass
+    _WORKER_PIPELINE = pipeline
+
+
+def _run_chunk(task) -> bytes:
+    batch, speed, ablation = task
+    outputs = _WORKER_PIPELINE.run_batch(batch, speed=speed, ablation=ablation)
+    # Plain pickle instead of torch's shared-memory reductions: results hold many
+    # tiny tensors and autograd graphs cannot cross process boundaries.
+    return pickle.dumps(detach_tree(outputs))
+
+
+class ParallelRunner:
+    """
+    Runs ``pipeline.run_batch`` over a dataset with a pool of forked workers.
+
+    Workers inherit the already-built pipeline (weights, spaCy model) through fork, so
+    each one is initialized exactly once and produces the same numbers as the serial
+    path. Chunks match ``iter_batches`` boundaries and results come back in input order.
+    """
+
+    def __init__(self, pipeline, workers: int = 1, batch_size: int = 8, threads_per_worker: Optional[int] = None):
+        self.pipeline = pipeline
+        self.workers = max(1, int(workers or 1))
+        self.batch_size = batch_size
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+
+    def _preload(self) -> None:
+        # load lazily-initialized models once here so forked workers share them
+        logic = getattr(self.pipeline, "logic", None)
+        if logic is not None and hasattr(logic, "nlp"):
+            logic.nlp
+        grounder = getattr(self.pipeline, "grounder", None)
+        if grounder is not None and hasattr(grounder, "sbert"):
+            grounder.sbert
+
+    def _parallel(self) -> bool:
+        # spawn would re-import spaCy/SBERT per worker and needs a pickled pipeline
+        return self.workers > 1 and "fork" in mp.get_all_start_methods()
+
+    def imap(self, items: List[Dict[str, Any]], speed: str = "balanced",
+             ablation: str | None = None) -> Iterator[List[Dict[str, Any]]]:
+        chunks = list(iter_batches(items, self.batch_size))
+        if not self._parallel():
+            for batch in chunks:
+                yield self.pipeline.run_batch(batch, speed=speed, ablation=ablation)
+            return
+        self._preload()
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, max(len(chunks), 1)),
+            mp_context=mp.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(self.pipeline, self.threads_per_worker),
+        ) as pool:
+            for payload in pool.map(_run_chunk, [(batch, speed, ablation) for batch in chunks]):
+                yield pickle.loads(payload)
+
+    def run(self, items: List[Dict[str, Any]], speed: str = "balanced",
+            ablation: str | None = None) -> List[Dict[str, Any]]:
+        outputs: List[Dict[str, Any]] = []
+        for outs in self.imap(items, speed=speed, ablation=ablation):
+            outputs.extend(outs)
+        return outputs
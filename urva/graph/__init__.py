@@ -1,3 +1,4 @@
 from .contradiction import ContradictionGraph, ConflictResult
+from .edges import EdgeTable
 
-__all__ = ["ContradictionGraph", "ConflictResult"]
+__all__ = ["ContradictionGraph", "ConflictResult", "EdgeTable"]
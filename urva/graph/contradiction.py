@@ -1,5 +1,11 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Tuple
+
+from urva.graph.edges import EdgeTable
+from urva.graph.lsh import token_blocking_pairs
+
+CONTRADICTION_LABELS = ("none", "confirm", "contradict")
+CONFIRM, CONTRADICT = 1, 2
 
 
 @dataclass
@@ -8,12 +14,15 @@ class ConflictResult:
     confirmations: int
     total_relations: int
     conflict_score: float
-    edges: List[Dict[str, str]]
+    edges: EdgeTable
+    approximate: bool = False
 
 
 class ContradictionGraph:
-    def __init__(self):
-        pass
+    def __init__(self, approximate: bool = False, approx_min_nodes: int = 256, max_block: int = 64):
+        self.approximate = approximate
+        self.approx_min_nodes = approx_min_nodes
+        self.max_block = max_block
 
     @staticmethod
     def _sentences(text: str) -> List[str]:
@@ -25,10 +34,14 @@ class ContradictionGraph:
         for idx, st in enumerate(states):
             for sent in self._sentences(st):
                 nodes.append((idx, sent.lower()))
+        if self.approximate and len(nodes) >= self.approx_min_nodes:
+            return self._build_blocked([sent for _, sent in nodes])
 
         contradictions = 0
         confirmations = 0
-        edges: List[Dict[str, str]] = []
+        src: List[int] = []
+        dst: List[int] = []
+        codes: List[int] = []
 
         for i in range(len(nodes)):
             for j in range(i + 1, len(nodes)):
@@ -38,10 +51,15 @@ class ContradictionGraph:
                     continue
                 if a == b:
                     confirmations += 1
-                    edges.append({"type": "confirm", "a": a, "b": b})
+                    code = CONFIRM
                 elif self._is_contradiction(a, b):
                     contradictions += 1
-                    edges.append({"type": "contradict", "a": a, "b": b})
+                    code = CONTRADICT
+                else:
+                    continue
+                src.append(i)
+                dst.append(j)
+                codes.append(code)
 
         total_relations = contradictions + confirmations
         conflict_score = contradictions / total_relations if total_relations else 0.0
@@ -50,7 +68,42 @@ class ContradictionGraph:
             confirmations=confirmations,
             total_relations=total_relations,
             conflict_score=conflict_score,
+            edges=EdgeTable([sent for _, sent in nodes], src, dst, codes, labels=CONTRADICTION_LABELS),
+        )
+
+    def _build_blocked(self, texts: List[str]) -> ConflictResult:
+        """
+        Candidate pairs only: exact duplicates (confirmations) via grouping, and pairs
+        sharing at least two tokens via an inverted index (possible contradictions).
+        """
+        groups: Dict[str, List[int]] = {}
+        for i, t in enumerate(texts):
+            groups.setdefault(t, []).append(i)
+        typed: List[Tuple[int, int, int]] = [
+            (g[x], g[y], CONFIRM)
+            for g in groups.values() if len(g) > 1
+            for x in range(len(g)) for y in range(x + 1, len(g))
+        ]
+        neg = [("not" in t or "no" in t) for t in texts]
+        for i, j in token_blocking_pairs([set(t.split()) for t in texts], max_block=self.max_block):
+            if texts[i] != texts[j] and neg[i] != neg[j]:
+                typed.append((i, j, CONTRADICT))
+        typed.sort()
+
+        edges = EdgeTable(
+            texts, [i for i, _, _ in typed], [j for _, j, _ in typed], [k for _, _, k in typed],
+            labels=CONTRADICTION_LABELS,
+        )
+        contradictions = edges.count("contradict")
+        confirmations = len(typed) - contradictions
+        total_relations = contradictions + confirmations
+        return ConflictResult(
+            contradictions=contradictions,
+            confirmations=confirmations,
+            total_relations=total_relations,
+            conflict_score=contradictions / total_relations if total_relations else 0.0,
             edges=edges,
+            approximate=True,
         )
 
     def _is_contradiction(self, a: str, b: str) -> bool:
@@ -0,0 +1,62 @@
+"""
+Compact, array-backed edge storage for conflict graphs.
+
+A graph keeps one sentence table plus ``int32`` endpoint arrays and a ``uint8``
+relation-code array instead of one dict (two sentence references and a type string)
+per pair. Dict edges are only materialized on demand, e.g. for export or debugging.
+"""
+from typing import Any, Dict, Iterator, List, Sequence
+import numpy as np
+
+from urva.graph.relations import RELATION_NAMES
+
+
+class EdgeTable:
+    __slots__ = ("sentences", "src", "dst", "codes", "labels")
+
+    def __init__(self, sentences: Sequence[str], src, dst, codes, labels: Sequence[str] = RELATION_NAMES):
+        self.sentences = list(sentences)
+        self.src = np.asarray(src, dtype=np.int32)
+        self.dst = np.asarray(dst, dtype=np.int32)
+        self.codes = np.asarray(codes, dtype=np.uint8)
+        self.labels = tuple(labels)
+
+    @classmethod
+    def empty(cls, sentences: Sequence[str] = (), labels: Sequence[str] = RELATION_NAMES) -> "EdgeTable":
+        return cls(sentences, [], [], [], labels)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _edge(self, i: int, j: int, code: int) -> Dict[str, str]:
+        return {"a": self.sentences[i], "b": self.sentences[j], "type": self.labels[code]}
+
+    def __getitem__(self, idx: int) -> Dict[str, str]:
+        return self._edge(int(self.src[idx]), int(self.dst[idx]), int(self.codes[idx]))
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for i, j, c in zip(self.src.tolist(), self.dst.tolist(), self.codes.tolist()):
+            yield self._edge(i, j, c)
+
+    def to_dicts(self) -> List[Dict[str, str]]:
+        return list(self)
+
+    def count(self, label: str) -> int:
+        return int(np.count_nonzero(self.codes == self.labels.index(label)))
+
+    def nodes(self) -> List[str]:
+        used = np.unique(np.concatenate([self.src, self.dst])) if len(self) else []
+        return [self.sentences[i] for i in used]
+
+    def nbytes(self) -> int:
+        return self.src.nbytes + self.dst.nbytes + self.codes.nbytes
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for k, v in state.items():
+            setattr(self, k, v)
+
+    def __repr__(self) -> str:
+        return f"EdgeTable(nodes={len(self.sentences)}, edges={len(self)})"
@@ -0,0 +1,164 @@
+"""
+Approximate candidate-pair generation for conflict graphs over long documents.
+
+Random-hyperplane LSH keeps only pairs whose cosine may exceed the entailment /
+high-similarity contradiction thresholds; the low-similarity contradiction rule
+(negation mismatch on dissimilar sentences) is estimated by sampling cross pairs,
+so the conflict score keeps its "contradictions over all pairs" meaning.
+"""
+import math
+from typing import Any, Dict, List, Set, Tuple
+import numpy as np
+
+from urva.graph.relations import CONTRADICTION, ENTAILMENT, NEUTRAL, classify
+
+
+class HyperplaneLSH:
+    def __init__(self, dim: int, bands: int = 16, bits: int = 8, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.bands = bands
+        self.bits = bits
+        self.planes = rng.normal(size=(bands, bits, dim)).astype(np.float32)
+        self._weights = (1 << np.arange(bits)).astype(np.int64)
+
+    @staticmethod
+    def collision_probability(cosine: float) -> float:
+        """Chance that one hyperplane puts two vectors at ``cosine`` on the same side."""
+        return 1.0 - math.acos(min(max(cosine, -1.0), 1.0)) / math.pi
+
+    @classmethod
+    def for_threshold(cls, dim: int, n: int, threshold: float = 0.65, recall: float = 0.95,
+                      max_bands: int = 32, seed: int = 0) -> "HyperplaneLSH":
+        """
+        Pick ``bits`` so random pairs rarely collide (about ``n`` candidates per band) and
+        ``bands`` so pairs at ``threshold`` cosine are found with probability ``recall``,
+        capped at ``max_bands`` so the candidate set stays near-linear in ``n``. Past the
+        cap, recall at exactly ``threshold`` falls as ``n`` grows (``expected_recall``);
+        near-duplicates are still found.
+        """
+        recall = min(max(recall, 0.0), 0.999999)
+        bits = max(4, math.ceil(math.log2(max(n, 2))))
+        p = cls.collision_probability(threshold) ** bits
+        bands = max(1, math.ceil(math.log(1.0 - recall) / math.log(1.0 - p)))
+        return cls(dim, bands=min(bands, max_bands), bits=bits, seed=seed)
+
+    def expected_recall(self, cosine: float) -> float:
+        return 1.0 - (1.0 - self.collision_probability(cosine) ** self.bits) ** self.bands
+
+    def band_signatures(self, emb: np.ndarray, band: int) -> np.ndarray:
+        return (emb @ self.planes[band].T > 0) @ self._weights
+
+    def signatures(self, emb: np.ndarray) -> np.ndarray:
+        emb = np.asarray(emb, dtype=np.float32)
+        return np.stack([self.band_signatures(emb, b) for b in range(self.bands)], axis=1)
+
+    def candidate_pairs(self, emb: np.ndarray, max_bucket: int = 256) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Unique ``i < j`` pairs sharing a bucket in at least one band, in row-major order.
+        Only the ``max_bucket`` lowest indices of a bucket are paired.
+        """
+        n = emb.shape[0]
+        # projected one band at a time in float32: no (n, bands, bits) intermediate
+        emb = np.asarray(emb, dtype=np.float32)
+        found: List[np.ndarray] = []
+        for b in range(self.bands):
+            sig = self.band_signatures(emb, b)
+            order = np.argsort(sig, kind="stable")
+            sig = sig[order]
+            starts = np.flatnonzero(np.r_[True, sig[1:] != sig[:-1]])
+            # position of each sorted row within its bucket
+            pos = np.arange(n) - np.repeat(starts, np.diff(np.r_[starts, n]))
+            # rows d apart in sorted order pair up when they share a bucket; buckets are
+            # contiguous, so once no bucket spans d + 1 rows there is nothing left
+            for d in range(1, max_bucket):
+                same = (sig[d:] == sig[:-d]) & (pos[d:] < max_bucket)
+                if not same.any():
+                    break
+                i, j = order[:-d][same], order[d:][same]
+                found.append(np.minimum(i, j) * n + np.maximum(i, j))
+        if not found:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        flat = np.unique(np.concatenate(found))
+        return flat // n, flat % n
+
+
+def _pair_cosine(unit: np.ndarray, rows: np.ndarray, cols: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    """Cosine of each (row, col) pair of L2-normalized rows, gathered a chunk at a time."""
+    out = np.empty(len(rows), dtype=np.float32)
+    for start in range(0, len(rows), chunk):
+        r, c = rows[start:start + chunk], cols[start:start + chunk]
+        out[start:start + chunk] = np.einsum("ij,ij->i", unit[r], unit[c])
+    return out
+
+
+def approximate_relations(emb: np.ndarray, neg: np.ndarray, recall: float = 0.95,
+                          sample_size: int = 4096, max_bands: int = 32, seed: int = 0) -> Dict[str, Any]:
+    """
+    Returns the high-similarity relations found through LSH (``rows``, ``cols``, ``codes``),
+    plus contradiction / confirmation counts in which the low-similarity contradictions
+    are a sampled estimate, and the exact number of pairs as ``total``.
+    ``low_contradiction_rate`` is the sampled share of negated/plain pairs that are
+    low-similarity contradictions.
+    """
+    n = emb.shape[0]
+    total = n * (n - 1) // 2
+    lsh = HyperplaneLSH.for_threshold(emb.shape[1], n, threshold=0.65, recall=recall, max_bands=max_bands,
+                                      seed=seed)
+    unit = np.asarray(emb, dtype=np.float32)
+    unit = unit / (np.linalg.norm(unit, axis=1, keepdims=True) + 1e-8)
+    rows, cols = lsh.candidate_pairs(unit)
+    # candidates are verified with exact cosines, so LSH false positives only cost a dot product
+    sim = _pair_cosine(unit, rows, cols)
+    codes = classify(sim, neg[rows], neg[cols])
+    # the low-similarity contradiction branch is estimated below, not counted here
+    keep = (sim >= 0.2) & (codes != NEUTRAL)
+    rows, cols, codes = rows[keep], cols[keep], codes[keep]
+
+    negs = np.flatnonzero(neg)
+    poss = np.flatnonzero(~neg)
+    cross = len(negs) * len(poss)
+    low_contradictions, rate = 0, 0.0
+    if cross:
+        if cross <= sample_size:
+            a, b = np.repeat(negs, len(poss)), np.tile(poss, len(negs))
+        else:
+            rng = np.random.default_rng(seed)
+            a, b = rng.choice(negs, sample_size), rng.choice(poss, sample_size)
+        rate = float(np.mean(_pair_cosine(unit, a, b) < 0.2))
+        low_contradictions = int(round(rate * cross))
+
+    contradictions = int(np.count_nonzero(codes == CONTRADICTION)) + low_contradictions
+    confirmations = int(np.count_nonzero(codes == ENTAILMENT))
+    return {
+        "rows": rows,
+        "cols": cols,
+        "codes": codes,
+        "contradictions": contradictions,
+        "confirmations": confirmations,
+        "total": max(total, 1),
+        "estimated_neutral": max(total - contradictions - confirmations, 0),
+        "low_contradiction_rate": rate,
+    }
+
+
+def token_blocking_pairs(token_sets: List[Set[str]], min_shared: int = 2,
+                         max_block: int = 64) -> List[Tuple[int, int]]:
+    """
+    Pairs of nodes sharing at least ``min_shared`` tokens, found through an inverted index.
+    Tokens occurring in more than ``max_block`` nodes (stop-word-like) are not used for
+    blocking, which keeps the candidate set near-linear in the number of nodes.
+    """
+    index: Dict[str, List[int]] = {}
+    for i, tokens in enumerate(token_sets):
+        for tok in tokens:
+            index.setdefault(tok, []).append(i)
+    shared: Dict[Tuple[int, int], int] = {}
+    for postings in index.values():
+        if len(postings) < 2 or len(postings) > max_block:
+            continue
+        for x in range(len(postings)):
+            for y in range(x + 1, len(postings)):
+                key = (postings[x], postings[y])
+                shared[key] = shared.get(key, 0) + 1
+    return sorted(k for k, v in shared.items() if v >= min_shared)
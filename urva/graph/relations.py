@@ -0,0 +1,40 @@
+"""
+Vectorized pairwise relation classification shared by the conflict-graph builders.
+"""
+from typing import List, Tuple
+import numpy as np
+
+NEUTRAL, ENTAILMENT, CONTRADICTION = 0, 1, 2
+RELATION_NAMES = ("neutral", "entailment", "contradiction")
+NEG_TOKENS = ("not", "never", "no", "cannot")
+
+
+def negation_flags(sentences: List[str]) -> np.ndarray:
+    # substring test on purpose, matching the per-pair rule it replaces
+    return np.array([any(tok in s.lower() for tok in NEG_TOKENS) for s in sentences], dtype=bool)
+
+
+def classify(sim: np.ndarray, neg_a: np.ndarray, neg_b: np.ndarray) -> np.ndarray:
+    """Relation codes for aligned arrays of cosine similarities and negation flags."""
+    diff = neg_a != neg_b
+    codes = np.zeros(sim.shape, dtype=np.uint8)
+    codes[sim > 0.7] = ENTAILMENT
+    codes[diff & ((sim > 0.65) | (sim < 0.2))] = CONTRADICTION
+    return codes
+
+
+def classify_pairs(emb: np.ndarray, neg: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Classify every pair ``i < j`` (row-major order) from one ``(n, dim)`` embedding matrix.
+    Returns ``(rows, cols, codes)``; pairs involving a zero embedding are neutral.
+    """
+    n = emb.shape[0]
+    rows, cols = np.triu_indices(n, k=1)
+    if n < 2:
+        return rows, cols, np.zeros(0, dtype=np.uint8)
+    norms = np.linalg.norm(emb, axis=1)
+    sims = (emb @ emb.T) / (norms[:, None] * norms[None, :] + 1e-8)
+    sim = sims[rows, cols]
+    codes = classify(sim, neg[rows], neg[cols])
+    codes[(norms[rows] == 0) | (norms[cols] == 0)] = NEUTRAL
+    return rows, cols, codes
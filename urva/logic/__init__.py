@@ -1,4 +1,7 @@
 from .engine import LogicEngine
 from .rules import LogicRules
+from .compiled import Rule, RuleSet, TextAnalysis
+from .context import StateAnalysis
+from .dsl import CheckSet
 
-__all__ = ["LogicEngine", "LogicRules"]
+__all__ = ["LogicEngine", "LogicRules", "Rule", "RuleSet", "TextAnalysis", "StateAnalysis", "CheckSet"]
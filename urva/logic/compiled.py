@@ -0,0 +1,233 @@
+"""
+Compiled rule set behind ``LogicEngine.apply_rules``.
+
+Rules are registered together with the keyword terms they look for. The terms of all
+registered rules are compiled into one alternation, so each text is lowercased once
+and scanned once no matter how many rules there are. Each rule then reads its hits,
+the shared tokens and the spaCy doc from a ``TextAnalysis``.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+Violation = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    check: Callable[["TextAnalysis"], Optional[Violation]]
+    terms: Tuple[str, ...] = ()
+    # match terms as whole whitespace-delimited tokens instead of substrings
+    tokens_only: bool = False
+
+
+class TextAnalysis:
+    __slots__ = ("text", "lower", "doc", "hits", "_tokens")
+
+    def __init__(self, text: str, lower: str, doc: Any, hits: Dict[str, Dict[str, int]]):
+        self.text = text
+        self.lower = lower
+        self.doc = doc
+        self.hits = hits
+        self._tokens: Optional[List[str]] = None
+
+    @property
+    def tokens(self) -> List[str]:
+        if self._tokens is None:
+            self._tokens = self.lower.split()
+        return self._tokens
+
+    def found(self, rule: str) -> Dict[str, int]:
+        """Terms of ``rule`` present in the text, mapped to their first position."""
+        return self.hits.get(rule, {})
+
+
+class RuleSet:
+    def __init__(self, rules: Sequence[Rule] = ()):
+        self._rules: List[Rule] = []
+        self.version = 0
+        for rule in rules:
+            self._rules.append(rule)
+        self._compile()
+
+    @property
+    def names(self) -> List[str]:
+        return [r.name for r in self._rules]
+
+    def register(self, rule: Rule) -> None:
+        if rule.name in self.names:
+            raise ValueError(f"rule {rule.name!r} is already registered")
+        self._rules.append(rule)
+        self._compile()
+
+    def unregister(self, name: str) -> None:
+        if name not in self.names:
+            raise KeyError(name)
+        self._rules = [r for r in self._rules if r.name != name]
+        self._compile()
+
+    def _compile(self) -> None:
+        alts: List[Tuple[str, str, bool]] = []
+        for rule in self._rules:
+            for term in rule.terms:
+                term = term.lower()
+                if rule.tokens_only and any(c.isspace() for c in term):
+                    # a whitespace-split token never contains whitespace
+                    continue
+                alts.append((term, rule.name, rule.tokens_only))
+        # longest first, so a term that is a prefix of another one cannot shadow it
+        alts.sort(key=lambda a: -len(a[0]))
+        self._alts = alts
+        self._index = {}
+        for g, (term, _, _) in enumerate(alts):
+            self._index.setdefault(term, g)
+        # plain literals keep the scan cheap; token boundaries are checked per match
+        self._scanner = re.compile("|".join(re.escape(t) for t in self._index)) if alts else None
+        # The scanner reports non-overlapping leftmost matches, one term per position.
+        # Every term that can start inside a match (the match itself, shorter terms at the
+        # same position, terms overlapping its tail) is verified at its precomputed offset.
+        self._candidates = {
+            g: [
+                (offset, h)
+                for offset in range(len(term))
+                for h, (other, _, _) in enumerate(alts)
+                if other.startswith(term[offset:]) or term[offset:].startswith(other)
+            ]
+            for g, (term, _, _) in enumerate(alts)
+        }
+        self.version += 1
+
+    def _matches_at(self, lower: str, g: int, pos: int) -> bool:
+        term, _, tokens_only = self._alts[g]
+        if not lower.startswith(term, pos):
+            return False
+        if not tokens_only:
+            return True
+        end = pos + len(term)
+        return (pos == 0 or lower[pos - 1].isspace()) and (end == len(lower) or lower[end].isspace())
+
+    def analyze(self, text: str, doc: Any = None) -> TextAnalysis:
+        lower = text.lower()
+        hits: Dict[str, Dict[str, int]] = {}
+        if self._scanner is not None:
+            for m in self._scanner.finditer(lower):
+                pos = m.start()
+                for offset, h in self._candidates[self._index[m.group()]]:
+                    if self._matches_at(lower, h, pos + offset):
+                        term, rule, _ = self._alts[h]
+                        hits.setdefault(rule, {}).setdefault(term, pos + offset)
+        return TextAnalysis(text, lower, doc, hits)
+
+    def apply(self, analysis: TextAnalysis) -> List[Violation]:
+        violations = []
+        for rule in self._rules:
+            v = rule.check(analysis)
+            if v:
+                violations.append(v)
+        return violations
+
+
+# ----------------- built-in rules -----------------
+_NEG_PATTERNS = [
+    (re.compile(r"\bis\b"), re.compile(r"\bis not\b")),
+    (re.compile(r"\bwas\b"), re.compile(r"\bwas not\b")),
+    (re.compile(r"\bcan\b"), re.compile(r"\bcannot\b")),
+]
+_ENTITY = re.compile(r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b')
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+VALID_LABELS = {"supports", "refutes", "not enough info",
+                "hallucinated", "supported", "yes", "no"}
+ASSERTION_MARKERS = ["definitely", "certainly", "always", "never",
+                     "impossible", "guaranteed", "proven"]
+
+
+def negation_conflict(a: TextAnalysis) -> Optional[Violation]:
+    if a.doc:
+        has_neg = any(tok.dep_ == "neg" for tok in a.doc)
+        has_aff = any(tok.pos_ == "VERB" and tok.dep_ != "neg" for tok in a.doc)
+        if has_neg and has_aff:
+            return {
+                "rule": "NegationConflict",
+                "category": "LOGICAL",
+                "detail": "Negation detected via dependency parse"
+            }
+        return None
+    if "not" not in a.lower:
+        # every negated pattern contains "not"
+        return None
+    for pos, neg in _NEG_PATTERNS:
+        if pos.search(a.lower) and neg.search(a.lower):
+            return {
+                "rule": "NegationConflict",
+                "category": "LOGICAL",
+                "detail": "Affirmative and negated claims coexist"
+            }
+    return None
+
+
+def entity_mismatch(a: TextAnalysis) -> Optional[Violation]:
+    if a.doc:
+        entities = [ent.text for ent in a.doc.ents]
+    else:
+        entities = _ENTITY.findall(a.text)
+    if len(entities) == len(set(entities)):
+        return None
+    seen: Dict[str, int] = {}
+    for e in entities:
+        seen[e] = seen.get(e, 0) + 1
+    if any(v > 2 for v in seen.values()):
+        return {
+            "rule": "EntityMismatch",
+            "category": "FACTUAL",
+            "detail": "Repeated conflicting entity references"
+        }
+    return None
+
+
+def numeric_inconsistency(a: TextAnalysis) -> Optional[Violation]:
+    numbers = _NUMBER.findall(a.text)
+    if len(numbers) < 2:
+        return None
+    nums = [float(n) for n in numbers]
+    if max(nums) > 10 * min(nums) and min(nums) > 0:
+        return {
+            "rule": "NumericInconsistency",
+            "category": "NUMERIC",
+            "detail": f"Suspicious numeric range: {min(nums)} vs {max(nums)}"
+        }
+    return None
+
+
+def label_violation(a: TextAnalysis) -> Optional[Violation]:
+    if len(a.found("LabelViolation")) <= 1:
+        return None
+    # rebuilt the same way as before so the detail string (a set repr) is unchanged
+    label_tokens = set(a.tokens) & VALID_LABELS
+    return {
+        "rule": "LabelViolation",
+        "category": "LOGICAL",
+        "detail": f"Multiple conflicting labels: {label_tokens}"
+    }
+
+
+def unsupported_assertion(a: TextAnalysis) -> Optional[Violation]:
+    hits = a.found("UnsupportedAssertion")
+    if not hits:
+        return None
+    found = [m for m in ASSERTION_MARKERS if m in hits]
+    return {
+        "rule": "UnsupportedAssertion",
+        "category": "FACTUAL",
+        "detail": f"Strong unsupported assertion markers: {found}"
+    }
+
+
+DEFAULT_RULES = (
+    Rule("NegationConflict", negation_conflict),
+    Rule("EntityMismatch", entity_mismatch),
+    Rule("NumericInconsistency", numeric_inconsistency),
+    Rule("LabelViolation", label_violation, terms=tuple(VALID_LABELS), tokens_only=True),
+    Rule("UnsupportedAssertion", unsupported_assertion, terms=tuple(ASSERTION_MARKERS)),
+)
@@ -0,0 +1,39 @@
+"""
+Per-sample analysis context: the logic rules run once over the three reasoning states
+and the result feeds both the fusion ``rule_violations`` and the checker verdict.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+STATE_KEYS = ("S1", "S2", "S3")
+
+
+@dataclass(frozen=True)
+class StateAnalysis:
+    texts: Tuple[str, ...]
+    per_state: Tuple[List[Dict[str, Any]], ...]
+
+    @classmethod
+    def build(cls, engine, states: Dict[str, Any],
+              apply_batch: Optional[Callable[[List[str]], List[List[Dict[str, Any]]]]] = None) -> "StateAnalysis":
+        """``apply_batch`` defaults to one ``engine.apply_rules_batch`` call over S1-S3."""
+        return cls.build_many(engine, [states], apply_batch)[0]
+
+    @classmethod
+    def build_many(cls, engine, states_list: List[Dict[str, Any]],
+                   apply_batch: Optional[Callable[[List[str]], List[List[Dict[str, Any]]]]] = None) -> List["StateAnalysis"]:
+        """Contexts for many samples from a single batched rules call over all their states."""
+        texts = [states.get(key, "") or "" for states in states_list for key in STATE_KEYS]
+        if apply_batch is None:
+            apply_batch = engine.apply_rules_batch
+        found = apply_batch(texts)
+        n = len(STATE_KEYS)
+        return [cls(tuple(texts[i:i + n]), tuple(found[i:i + n])) for i in range(0, len(texts), n)]
+
+    @property
+    def states(self) -> Dict[str, str]:
+        return dict(zip(STATE_KEYS, self.texts))
+
+    @property
+    def violations(self) -> List[Dict[str, Any]]:
+        return [v for found in self.per_state for v in found]
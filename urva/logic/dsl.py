@@ -0,0 +1,306 @@
+"""
+Declarative checks from the ``"checks"`` section of ``logic_rules.json``.
+
+    {"name": "ProbabilityRange", "type": "numeric_bounds", "category": "NUMERIC",
+     "keywords": ["probability"], "unit": "", "min": 0, "max": 1, "window": 40}
+    {"name": "FutureDate", "type": "date_not_in_future", "category": "FACTUAL",
+     "keywords": ["was", "happened"]}
+    {"name": "TaxonomyClash", "type": "pattern", "category": "LOGICAL", "all": ["mammal", "fish"]}
+
+``keywords`` restrict numeric/date checks to values within ``window`` characters of a
+keyword; ``unit`` ("%", "c", "km/h", "kpa", "km", "m", "mi", or "" for unit-less, or a
+list of these) restricts them to values carrying that unit. Bare numbers that read as
+years ("in 2024") are never bounds-checked. Pattern checks fire when ``any`` or ``all`` of their terms
+occur as whole words.
+
+Every check compiles into one extraction regex (numbers with units, ISO dates, all
+keywords). A batch of texts is scanned once, and each check is then a numpy
+expression over the extracted (text, position, value) arrays, so adding checks does
+not add per-text Python work.
+"""
+import datetime
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+CATEGORIES = ("FACTUAL", "NUMERIC", "LOGICAL")
+CHECK_TYPES = ("numeric_bounds", "date_not_in_future", "pattern")
+
+_UNIT_ALIASES = {
+    "%": "%", "percent": "%",
+    "c": "c", "°c": "c", "celsius": "c",
+    "km/h": "km/h", "kph": "km/h",
+    "kpa": "kpa",
+    "km": "km", "kilometer": "km", "kilometers": "km", "kilometre": "km", "kilometres": "km",
+    "m": "m", "meter": "m", "meters": "m", "metre": "m", "metres": "m",
+    "mi": "mi", "mile": "mi", "miles": "mi",
+}
+UNITS = ("", "%", "c", "km/h", "kpa", "km", "m", "mi")
+_UNIT_PATTERN = (
+    r"%|percent\b|°c\b|celsius\b|km/h|kph\b|kpa\b|c\b"
+    r"|kilometers?\b|kilometres?\b|km\b|meters?\b|metres?\b|m\b|miles?\b|mi\b"
+)
+_BASE_PATTERN = (
+    r"(?P<date>\b\d{4}-\d{2}-\d{2}\b)"
+    r"|(?<![\w.])(?P<num>-?\d+(?:\.\d+)?)(?:\s?(?P<unit>" + _UNIT_PATTERN + r"))?"
+)
+
+
+_MONTHS = ("january", "february", "march", "april", "may", "june", "july", "august", "september",
+           "october", "november", "december", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep",
+           "sept", "oct", "nov", "dec")
+# a bare number is only read as a year after one of these (or a month and optional day) ...
+_YEAR_BEFORE = re.compile(
+    r"(?:\b(?:in|since|by|of|until|from|year|around|circa)|\b(?:" + "|".join(_MONTHS)
+    + r")\.?(?:\s+\d{1,2}(?:st|nd|rd|th)?,?)?)\s+$"
+)
+# ... and when the next word (if any) is not a unit or noun: "in 2100 feet" is a length
+_YEAR_AFTER = re.compile(r"\s*([a-z]+)")
+_AFTER_YEAR_WORDS = frozenset((
+    "a", "ad", "after", "an", "and", "as", "at", "bc", "bce", "before", "but", "by", "ce", "for",
+    "he", "i", "in", "is", "it", "on", "or", "she", "that", "the", "then", "they", "to", "was",
+    "we", "were", "when", "which", "while", "with",
+))
+
+
+def _year_like(lower: str, start: int, end: int) -> bool:
+    if not _YEAR_BEFORE.search(lower, max(0, start - 24), start):
+        return False
+    after = _YEAR_AFTER.match(lower, end)
+    return after is None or after.group(1) in _AFTER_YEAR_WORDS
+
+
+def _array(values: List[Any], dtype) -> np.ndarray:
+    return np.asarray(values, dtype=dtype) if values else np.zeros(0, dtype=dtype)
+
+
+class _Extraction:
+    """Flat arrays of everything the scanner found in one batch of texts."""
+
+    def __init__(self, n_texts: int, n_keywords: int):
+        self.n_texts = n_texts
+        self.n_keywords = n_keywords
+        self.num = {"text": [], "start": [], "end": [], "value": [], "unit": [], "integral": [], "year": []}
+        self.date = {"text": [], "start": [], "end": [], "ordinal": []}
+        self.kw = {"text": [], "start": [], "end": [], "id": []}
+        self.stride = 1
+
+    def finalize(self) -> "_Extraction":
+        types = {"value": np.float64, "integral": bool, "year": bool}
+        for table in (self.num, self.date, self.kw):
+            for key, values in table.items():
+                table[key] = _array(values, types.get(key, np.int64))
+        hits = np.zeros((self.n_texts, self.n_keywords), dtype=bool)
+        hits[self.kw["text"], self.kw["id"]] = True
+        self.kw_hits = hits
+        return self
+
+
+class CheckSet:
+    def __init__(self, specs: Sequence[Dict[str, Any]] = ()):
+        self.specs = [self._validate(spec) for spec in specs]
+        keywords: List[str] = []
+        for spec in self.specs:
+            for term in spec["keywords"] + spec["any"] + spec["all"]:
+                if term not in keywords:
+                    keywords.append(term)
+        self.keywords = keywords
+        self._kw_index = {term: i for i, term in enumerate(keywords)}
+        # a matched keyword also counts for every shorter keyword it contains as whole words
+        self._credits = [
+            [j for j, other in enumerate(keywords) if re.search(rf"\b{re.escape(other)}\b", term)]
+            for term in keywords
+        ]
+        # check x keyword requirement matrices: a batch only evaluates checks whose
+        # keywords (and value kinds) occur in it at all
+        self._need_any = np.zeros((len(self.specs), len(keywords)), dtype=np.int64)
+        self._need_all = np.zeros((len(self.specs), len(keywords)), dtype=np.int64)
+        for s, spec in enumerate(self.specs):
+            for term in spec["keywords"] + spec["any"]:
+                self._need_any[s, self._kw_index[term]] = 1
+            for term in spec["all"]:
+                self._need_all[s, self._kw_index[term]] = 1
+            spec["_ids"] = np.array([self._kw_index[t] for t in spec["all"] or spec["any"]], dtype=np.int64)
+        self._scoped = self._need_any.any(axis=1)
+        self._all_count = self._need_all.sum(axis=1)
+        self._kind = np.array([CHECK_TYPES.index(spec["type"]) for spec in self.specs], dtype=np.int64)
+        pattern = _BASE_PATTERN
+        if keywords:
+            alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+            pattern = rf"(?P<kw>\b(?:{alternation})\b)|" + pattern
+        self._scanner = re.compile(pattern)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    @property
+    def date_dependent(self) -> bool:
+        """Whether results depend on the evaluation date (``date_not_in_future`` checks)."""
+        return any(spec["type"] == "date_not_in_future" for spec in self.specs)
+
+    @staticmethod
+    def _validate(spec: Dict[str, Any]) -> Dict[str, Any]:
+        name = spec.get("name")
+        if not name:
+            raise ValueError(f"check without a name: {spec}")
+        if spec.get("type") not in CHECK_TYPES:
+            raise ValueError(f"check {name!r}: type must be one of {CHECK_TYPES}")
+        if spec.get("category") not in CATEGORIES:
+            raise ValueError(f"check {name!r}: category must be one of {CATEGORIES}")
+        units = spec.get("unit")
+        if units is not None:
+            units = [units] if isinstance(units, str) else list(units)
+            units = [_UNIT_ALIASES.get(u.lower(), u.lower()) for u in units]
+            if any(u not in UNITS for u in units):
+                raise ValueError(f"check {name!r}: unit must be one of {UNITS} or a list of them")
+        compiled = {
+            **spec,
+            "unit": units,
+            "keywords": [k.lower() for k in spec.get("keywords", [])],
+            "any": [k.lower() for k in spec.get("any", [])],
+            "all": [k.lower() for k in spec.get("all", [])],
+            "window": int(spec.get("window", 40)),
+        }
+        if spec["type"] == "pattern" and not (compiled["any"] or compiled["all"]):
+            raise ValueError(f"check {name!r}: pattern checks need 'any' or 'all' terms")
+        return compiled
+
+    # ----------------- extraction -----------------
+    def _extract(self, texts: Sequence[str]) -> _Extraction:
+        ex = _Extraction(len(texts), len(self.keywords))
+        num, date, kw = ex.num, ex.date, ex.kw
+        for t, text in enumerate(texts):
+            lower = text.lower()
+            ex.stride = max(ex.stride, len(lower) + 1)
+            for m in self._scanner.finditer(lower):
+                if m.group("num") is not None:
+                    raw = m.group("num")
+                    unit = m.group("unit")
+                    num["text"].append(t)
+                    num["start"].append(m.start())
+                    num["end"].append(m.end())
+                    num["value"].append(float(raw))
+                    num["unit"].append(UNITS.index(_UNIT_ALIASES[unit]) if unit else 0)
+                    num["integral"].append("." not in raw)
+                    num["year"].append(not unit and 1000 <= float(raw) <= 2999 and "." not in raw
+                                       and _year_like(lower, m.start(), m.end()))
+                elif m.group("date") is not None:
+                    try:
+                        ordinal = datetime.date.fromisoformat(m.group("date")).toordinal()
+                    except ValueError:
+                        continue
+                    date["text"].append(t)
+                    date["start"].append(m.start())
+                    date["end"].append(m.end())
+                    date["ordinal"].append(ordinal)
+                else:
+                    for j in self._credits[self._kw_index[m.group("kw")]]:
+                        kw["text"].append(t)
+                        kw["start"].append(m.start())
+                        kw["end"].append(m.end())
+                        kw["id"].append(j)
+        return ex.finalize()
+
+    def _near(self, ex: _Extraction, text: np.ndarray, start: np.ndarray, end: np.ndarray,
+              keywords: List[str], window: int) -> np.ndarray:
+        """Whether each value lies within ``window`` characters of one of ``keywords``."""
+        ids = [self._kw_index[k] for k in keywords]
+        sel = np.isin(ex.kw["id"], ids)
+        kw_key = ex.kw["text"][sel] * ex.stride + ex.kw["start"][sel]
+        order = np.argsort(kw_key, kind="stable")
+        kw_key, kw_text = kw_key[order], ex.kw["text"][sel][order]
+        kw_start, kw_end = ex.kw["start"][sel][order], ex.kw["end"][sel][order]
+        near = np.zeros(len(text), dtype=bool)
+        if not len(kw_key) or not len(text):
+            return near
+        idx = np.searchsorted(kw_key, text * ex.stride + start)
+        prev = np.clip(idx - 1, 0, len(kw_key) - 1)
+        nxt = np.clip(idx, 0, len(kw_key) - 1)
+        near |= (idx > 0) & (kw_text[prev] == text) & (start - kw_end[prev] <= window)
+        near |= (idx < len(kw_key)) & (kw_text[nxt] == text) & (kw_start[nxt] - end <= window)
+        return near
+
+    # ----------------- evaluation -----------------
+    def evaluate(self, texts: Sequence[str], today: Optional[datetime.date] = None) -> List[List[Dict[str, Any]]]:
+        out: List[List[Dict[str, Any]]] = [[] for _ in texts]
+        if not self.specs or not texts:
+            return out
+        ex = self._extract(texts)
+        today = today or datetime.date.today()
+        present = ex.kw_hits.any(axis=0).astype(np.int64)
+        active = ((self._need_any @ present) > 0) | ~self._scoped
+        active &= (self._need_all @ present) == self._all_count
+        n_num, n_date = len(ex.num["value"]), len(ex.date["ordinal"])
+        # per kind in CHECK_TYPES order: numeric bounds, future dates, patterns
+        active &= np.array([n_num > 0, n_num + n_date > 0, True])[self._kind]
+        for s in np.flatnonzero(active).tolist():
+            spec = self.specs[s]
+            if spec["type"] == "numeric_bounds":
+                rows, values = self._numeric_bounds(ex, spec)
+                detail = spec.get("detail", self._bounds_text(spec))
+                found = [f"{detail}: {v:g}" for v in values]
+            elif spec["type"] == "date_not_in_future":
+                rows, values = self._future_dates(ex, spec, today)
+                detail = spec.get("detail", "Date in the future")
+                found = [f"{detail}: {v}" for v in values]
+            else:
+                rows = self._pattern(ex, spec)
+                terms = spec["all"] or spec["any"]
+                found = [spec.get("detail", f"Matched {terms}")] * len(rows)
+            for row, detail in zip(rows.tolist(), found):
+                out[row].append({"rule": spec["name"], "category": spec["category"], "detail": detail})
+        return out
+
+    @staticmethod
+    def _bounds_text(spec: Dict[str, Any]) -> str:
+        lo, hi = spec.get("min"), spec.get("max")
+        if lo is not None and hi is not None:
+            return f"Value outside [{lo}, {hi}]"
+        return f"Value below {lo}" if lo is not None else f"Value above {hi}"
+
+    @staticmethod
+    def _first_per_text(text: np.ndarray, mask: np.ndarray, values: np.ndarray):
+        rows, first = np.unique(text[mask], return_index=True)
+        return rows, values[mask][first]
+
+    def _numeric_bounds(self, ex: _Extraction, spec: Dict[str, Any]):
+        num = ex.num
+        # a year is a date, not a quantity: "the probability of rain in 2024 was 0.3"
+        mask = ~num["year"]
+        if spec["unit"] is not None:
+            mask &= np.isin(num["unit"], [UNITS.index(u) for u in spec["unit"]])
+        if spec["keywords"]:
+            mask &= self._near(ex, num["text"], num["start"], num["end"], spec["keywords"], spec["window"])
+        out_of_bounds = np.zeros_like(mask)
+        if spec.get("min") is not None:
+            out_of_bounds |= num["value"] < float(spec["min"])
+        if spec.get("max") is not None:
+            out_of_bounds |= num["value"] > float(spec["max"])
+        return self._first_per_text(num["text"], mask & out_of_bounds, num["value"])
+
+    def _future_dates(self, ex: _Extraction, spec: Dict[str, Any], today: datetime.date):
+        num, date = ex.num, ex.date
+        # bare years count as dates too, when they read as years ("in 2150", "March 2150")
+        years = num["year"] & (num["value"] >= 1000)
+        date_mask = date["ordinal"] > today.toordinal()
+        year_mask = years & (num["value"] > today.year)
+        if spec["keywords"]:
+            date_mask &= self._near(ex, date["text"], date["start"], date["end"], spec["keywords"], spec["window"])
+            year_mask &= self._near(ex, num["text"], num["start"], num["end"], spec["keywords"], spec["window"])
+        text = np.concatenate([date["text"][date_mask], num["text"][year_mask]])
+        start = np.concatenate([date["start"][date_mask], num["start"][year_mask]])
+        labels = np.array(
+            [datetime.date.fromordinal(int(o)).isoformat() for o in date["ordinal"][date_mask]]
+            + [str(int(v)) for v in num["value"][year_mask]],
+            dtype=object,
+        )
+        order = np.lexsort((start, text))
+        return self._first_per_text(text[order], np.ones(len(order), dtype=bool), labels[order])
+
+    def _pattern(self, ex: _Extraction, spec: Dict[str, Any]) -> np.ndarray:
+        if spec["all"]:
+            fired = ex.kw_hits[:, spec["_ids"]].all(axis=1)
+        else:
+            fired = ex.kw_hits[:, spec["_ids"]].any(axis=1)
+        return np.flatnonzero(fired)
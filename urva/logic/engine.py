@@ -1,107 +1,176 @@
-import re
+import datetime
 import json
-from typing import List, Dict, Any
+import threading
+from collections import deque
+from typing import List, Dict, Any, Deque, Iterable, Iterator, Optional, Sequence, Tuple
 
-try:
-    import spacy
-    _nlp = spacy.load("en_core_web_sm")
-    _SPACY_AVAILABLE = True
-except Exception:
-    _nlp = None
-    _SPACY_AVAILABLE = False
+from urva.logic.compiled import DEFAULT_RULES, Rule, RuleSet
+from urva.logic.dsl import CheckSet
+from urva.utils.lru import LRUCache
+
+DEFAULT_SPACY_MODEL = "en_core_web_sm"
+# only what the rules read: dep_ (parser), pos_ (tagger + attribute_ruler), ents (ner)
+DEFAULT_SPACY_COMPONENTS = ("tok2vec", "tagger", "attribute_ruler", "parser", "ner")
+
+_NLP_CACHE: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+_NLP_LOCK = threading.Lock()
+
+
+def load_spacy(model: str = DEFAULT_SPACY_MODEL, components: Sequence[str] = DEFAULT_SPACY_COMPONENTS):
+    """
+    Load (once per process) a spaCy pipeline restricted to ``components``; other
+    components are excluded, not just disabled, so they are never deserialized.
+    Returns None when spaCy or the model is unavailable.
+    """
+    key = (model, tuple(components))
+    with _NLP_LOCK:
+        if key not in _NLP_CACHE:
+            try:
+                import spacy
+                try:
+                    available = spacy.info(model).get("components", [])
+                except Exception:
+                    available = []
+                exclude = [name for name in available if name not in key[1]]
+                _NLP_CACHE[key] = spacy.load(model, exclude=exclude)
+            except Exception:
+                _NLP_CACHE[key] = None
+        return _NLP_CACHE[key]
 
 
 class LogicEngine:
-    def __init__(self, rules: List[Dict[str, Any]]):
+    def __init__(self, rules: List[Dict[str, Any]], registry: Optional[RuleSet] = None,
+                 spacy_model: Optional[str] = DEFAULT_SPACY_MODEL,
+                 spacy_components: Sequence[str] = DEFAULT_SPACY_COMPONENTS,
+                 n_process: int = 1, batch_size: int = 64, memo_size: int = 4096):
         self.rules = rules
+        # compiled once; every apply_rules call reuses the same scanner and patterns
+        self.registry = registry if registry is not None else RuleSet(DEFAULT_RULES)
+        # declarative checks ("checks" in logic_rules.json), evaluated a batch at a time
+        self.checks = CheckSet(rules.get("checks", []) if isinstance(rules, dict) else [])
+        # spaCy is loaded on first use; spacy_model=None runs the regex fallbacks only
+        self.spacy_model = spacy_model
+        self.spacy_components = tuple(spacy_components)
+        self.n_process = n_process
+        self.batch_size = batch_size
+        # reasoner states come from small template banks, so the same texts recur constantly;
+        # keys carry the rule-set version (and evaluation date), so stale results are never reused
+        self.memo = LRUCache(memo_size)
 
     @classmethod
-    def from_file(cls, path: str) -> "LogicEngine":
+    def from_file(cls, path: str, **kwargs) -> "LogicEngine":
         with open(path, "r", encoding="utf-8") as f:
             rules = json.load(f)
-        return cls(rules)
+        return cls(rules, **kwargs)
+
+    @property
+    def nlp(self):
+        if self.spacy_model is None:
+            return None
+        return load_spacy(self.spacy_model, self.spacy_components)
+
+    @property
+    def rules_version(self) -> int:
+        return self.registry.version
+
+    def evaluation_date(self) -> Optional[datetime.date]:
+        """Today for date-dependent checks, else None; part of every memo and cache key."""
+        return datetime.date.today() if self.checks.date_dependent else None
+
+    def cache_identity(self) -> Dict[str, Any]:
+        """Everything besides the text that determines ``apply_rules`` output; keys persistent caches."""
+        return {
+            "rules": self.rules,
+            "registry": self.registry.names,
+            "rules_version": self.rules_version,
+            # the parser and regex fallback paths report different violations
+            "spacy_model": self.spacy_model if self.nlp is not None else None,
+            "spacy_components": list(self.spacy_components),
+            "date": self.evaluation_date(),
+        }
+
+    def register_rule(self, rule: Rule) -> None:
+        self.registry.register(rule)
+        self.memo.clear()
+
+    def unregister_rule(self, name: str) -> None:
+        self.registry.unregister(name)
+        self.memo.clear()
+
+    def memo_stats(self) -> Dict[str, Any]:
+        return {**self.memo.stats(), "rules_version": self.rules_version}
+
+    def _evaluate(self, texts: List[str], docs: List[Any], version: int,
+                  today: Optional[datetime.date]) -> List[List[Dict[str, Any]]]:
+        checked = self.checks.evaluate(texts, today=today)
+        results = []
+        for text, doc, extra in zip(texts, docs, checked):
+            found = self.registry.apply(self.registry.analyze(text, doc)) + extra
+            self.memo.put((text, version, today), found)
+            results.append(found)
+        return results
 
     def check_statement(self, text: str) -> List[Dict[str, Any]]:
         return self.apply_rules(text)
 
     def apply_rules(self, text: str) -> List[Dict[str, Any]]:
-        violations = []
-        text_lower = text.lower()
-        doc = _nlp(text) if _SPACY_AVAILABLE and _nlp else None
-
-        # Rule 1: Negation Conflict (SpaCy-based)
-        if doc:
-            has_neg = any(tok.dep_ == "neg" for tok in doc)
-            has_aff = any(tok.pos_ == "VERB" and tok.dep_ != "neg" for tok in doc)
-            if has_neg and has_aff:
-                violations.append({
-                    "rule": "NegationConflict",
-                    "category": "LOGICAL",
-                    "detail": "Negation detected via dependency parse"
-                })
-        else:
-            neg_patterns = [
-                (r"\bis\b", r"\bis not\b"),
-                (r"\bwas\b", r"\bwas not\b"),
-                (r"\bcan\b", r"\bcannot\b"),
-            ]
-            for pos, neg in neg_patterns:
-                if re.search(pos, text_lower) and re.search(neg, text_lower):
-                    violations.append({
-                        "rule": "NegationConflict",
-                        "category": "LOGICAL",
-                        "detail": "Affirmative and negated claims coexist"
-                    })
-                    break
-
-        # Rule 2: Entity Mismatch (SpaCy NER)
-        if doc:
-            entities = [ent.text for ent in doc.ents]
+        version, today = self.rules_version, self.evaluation_date()
+        found = self.memo.get((text, version, today))
+        if found is LRUCache.MISS:
+            nlp = self.nlp
+            found = self._evaluate([text], [nlp(text) if nlp else None], version, today)[0]
+        return list(found)
+
+    def iter_rules(self, texts: Iterable[str], n_process: Optional[int] = None,
+                   batch_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream texts through ``nlp.pipe`` and yield each text's violations in order.
+        Memoized texts are answered from the memo and never reach the parser; parsed
+        texts are evaluated ``batch_size`` at a time so the declarative checks vectorize.
+        """
+        nlp = self.nlp
+        version, today = self.rules_version, self.evaluation_date()
+        batch_size = batch_size or self.batch_size
+        pending: List[Tuple[Any, str, int]] = []
+        order: Deque[int] = deque()
+        results: Dict[int, List[Dict[str, Any]]] = {}
+
+        def misses() -> Iterator[Tuple[str, int]]:
+            for i, text in enumerate(texts):
+                order.append(i)
+                found = self.memo.get((text, version, today))
+                if found is LRUCache.MISS:
+                    yield text, i
+                else:
+                    results[i] = found
+
+        def ready() -> Iterator[List[Dict[str, Any]]]:
+            while order and order[0] in results:
+                yield list(results.pop(order.popleft()))
+
+        if nlp is None:
+            parsed = ((None, item) for item in misses())
         else:
-            entities = re.findall(r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b', text)
-        if len(entities) != len(set(entities)):
-            seen = {}
-            for e in entities:
-                seen[e] = seen.get(e, 0) + 1
-            if any(v > 2 for v in seen.values()):
-                violations.append({
-                    "rule": "EntityMismatch",
-                    "category": "FACTUAL",
-                    "detail": "Repeated conflicting entity references"
-                })
-
-        # Rule 3: Numeric Inconsistency
-        numbers = re.findall(r'\b\d+(?:\.\d+)?\b', text)
-        if len(numbers) >= 2:
-            nums = [float(n) for n in numbers]
-            if max(nums) > 10 * min(nums) and min(nums) > 0:
-                violations.append({
-                    "rule": "NumericInconsistency",
-                    "category": "NUMERIC",
-                    "detail": f"Suspicious numeric range: {min(nums)} vs {max(nums)}"
-                })
-
-        # Rule 4: Label Violation
-        valid_labels = {"supports", "refutes", "not enough info",
-                        "hallucinated", "supported", "yes", "no"}
-        tokens = set(text_lower.split())
-        label_tokens = tokens & valid_labels
-        if len(label_tokens) > 1:
-            violations.append({
-                "rule": "LabelViolation",
-                "category": "LOGICAL",
-                "detail": f"Multiple conflicting labels: {label_tokens}"
-            })
-
-        # Rule 5: Unsupported Assertion
-        assertion_markers = ["definitely", "certainly", "always", "never",
-                             "impossible", "guaranteed", "proven"]
-        found = [m for m in assertion_markers if m in text_lower]
-        if found:
-            violations.append({
-                "rule": "UnsupportedAssertion",
-                "category": "FACTUAL",
-                "detail": f"Strong unsupported assertion markers: {found}"
-            })
-
-        return violations
+            # contexts are plain (text, index) tuples so they survive n_process > 1
+            parsed = nlp.pipe(((text, (text, i)) for text, i in misses()), as_tuples=True,
+                              n_process=n_process or self.n_process, batch_size=batch_size)
+
+        def flush() -> None:
+            docs, batch, index = zip(*pending)
+            for i, found in zip(index, self._evaluate(list(batch), list(docs), version, today)):
+                results[i] = found
+            pending.clear()
+
+        for doc, (text, i) in parsed:
+            pending.append((doc, text, i))
+            if len(pending) >= batch_size:
+                flush()
+                yield from ready()
+        if pending:
+            flush()
+        yield from ready()
+
+    def apply_rules_batch(self, texts: Iterable[str], n_process: Optional[int] = None,
+                          batch_size: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+        """``apply_rules`` over many texts (up to whole datasets) through one ``nlp.pipe`` stream."""
+        return list(self.iter_rules(texts, n_process=n_process, batch_size=batch_size))
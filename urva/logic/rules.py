@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
 
 
 @dataclass
@@ -10,3 +10,5 @@ class LogicRules:
     numeric_bounds: List[str]
     existence_rules: List[str]
     contradiction_rules: List[str]
+    # executable counterparts of the prose rules, compiled by urva.logic.dsl.CheckSet
+    checks: List[Dict[str, Any]] = field(default_factory=list)
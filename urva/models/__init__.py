@@ -1,4 +1,7 @@
+from .embedding_cache import EmbeddingCache
+from .grounded import GroundedFacts
 from .grounder import FactGrounder
 from .reasoner import MultiHopReasoner
+from .sbert import load_sbert, sbert_stats
 
-__all__ = ["FactGrounder", "MultiHopReasoner"]
+__all__ = ["EmbeddingCache", "FactGrounder", "GroundedFacts", "MultiHopReasoner", "load_sbert", "sbert_stats"]
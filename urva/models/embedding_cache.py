@@ -0,0 +1,160 @@
+"""
+Bounded cache of sentence embeddings keyed by text.
+
+The memory tier is an LRU of float32 vectors. The optional disk tier is a
+fixed-capacity ``np.memmap`` (``embeddings.f32``) plus an append-only ``keys.txt``
+holding one sha256 text hash per row, so embeddings survive restarts and are paged
+in on demand. Appends hold an exclusive ``flock``, so forked workers can share one
+cache directory.
+
+Vectors are only comparable within one model, so each model gets its own
+subdirectory of ``path`` with a ``meta.json`` recording the model and embedding
+size; switching models starts a new tier instead of serving the old vectors.
+"""
+import hashlib
+import json
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from urva.utils.lru import LRUCache
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+
+def _model_dir(model: Optional[str]) -> str:
+    name = model or "default"
+    slug = re.sub(r"[^\w.-]+", "_", name)[-48:]
+    return f"{slug}-{hashlib.sha256(name.encode('utf-8')).hexdigest()[:12]}"
+
+
+class EmbeddingCache:
+    def __init__(self, max_entries: int = 65536, path: Optional[str] = None, disk_capacity: int = 1_000_000,
+                 model: Optional[str] = None):
+        self.memory = LRUCache(max_entries)
+        # model name or path the embeddings come from; selects the disk tier
+        self.model = model
+        self.path = Path(path) / _model_dir(model) if path else None
+        self.disk_capacity = disk_capacity
+        self.dim: Optional[int] = None
+        self.disk_hits = 0
+        self._rows: Dict[str, int] = {}
+        self._keys_offset = 0
+        self._mmap: Optional[np.memmap] = None
+        self._pid: Optional[int] = None
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(self.path / "lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _open(self, dim: Optional[int] = None) -> Optional[np.memmap]:
+        """Map the disk tier, once per process, as soon as the embedding size is known."""
+        if self.path is None:
+            return None
+        if self._mmap is not None and self._pid == os.getpid():
+            return self._mmap
+        meta, data = self.path / "meta.json", self.path / "embeddings.f32"
+        with self._locked():
+            if meta.exists():
+                stored = json.loads(meta.read_text(encoding="utf-8"))
+                if stored.get("model") != self.model:
+                    raise ValueError(f"embedding cache {self.path} holds vectors of model "
+                                     f"{stored.get('model')!r}, not {self.model!r}")
+                self.dim = int(stored["dim"])
+            elif dim is None:
+                return None
+            else:
+                self.dim = dim
+                meta.write_text(json.dumps({"model": self.model, "dim": dim}), encoding="utf-8")
+            if data.exists():
+                capacity = data.stat().st_size // (4 * self.dim)
+                self._mmap = np.memmap(data, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+            else:
+                self._mmap = np.memmap(data, dtype=np.float32, mode="w+", shape=(self.disk_capacity, self.dim))
+        self._pid = os.getpid()
+        self._rows, self._keys_offset = {}, 0
+        self._sync_keys()
+        return self._mmap
+
+    def _sync_keys(self) -> None:
+        """Pick up rows appended (possibly by other processes) since the last sync."""
+        keys = self.path / "keys.txt"
+        if not keys.exists() or keys.stat().st_size == self._keys_offset:
+            return
+        with open(keys, "rb") as f:
+            f.seek(self._keys_offset)
+            chunk = f.read()
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        for line in complete.decode("ascii").splitlines():
+            self._rows.setdefault(line, len(self._rows))
+        self._keys_offset += len(complete)
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        found: List[Optional[np.ndarray]] = []
+        mmap = None
+        for text in texts:
+            emb = self.memory.get(text)
+            if emb is LRUCache.MISS:
+                emb = None
+                if mmap is None:
+                    mmap = self._open()
+                    if mmap is not None:
+                        self._sync_keys()
+                row = self._rows.get(self._digest(text)) if mmap is not None else None
+                if row is not None:
+                    emb = np.array(mmap[row])
+                    self.memory.put(text, emb)
+                    self.disk_hits += 1
+            found.append(emb)
+        return found
+
+    def put_many(self, texts: Sequence[str], embeddings: np.ndarray) -> None:
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        for text, emb in zip(texts, embeddings):
+            self.memory.put(text, emb)
+        mmap = self._open(embeddings.shape[1]) if len(texts) else None
+        if mmap is None:
+            return
+        if embeddings.shape[1] != self.dim:
+            raise ValueError(f"embedding cache {self.path} stores {self.dim}-d vectors of model "
+                             f"{self.model!r}, got {embeddings.shape[1]}-d")
+        with self._locked():
+            self._sync_keys()
+            lines = []
+            for text, emb in zip(texts, embeddings):
+                digest = self._digest(text)
+                if digest in self._rows or len(self._rows) >= len(mmap):
+                    continue
+                row = len(self._rows)
+                mmap[row] = emb
+                self._rows[digest] = row
+                lines.append(digest + "\n")
+            if lines:
+                # rows are flushed before their keys become visible to other readers
+                mmap.flush()
+                with open(self.path / "keys.txt", "a", encoding="ascii") as f:
+                    f.write("".join(lines))
+                self._keys_offset = (self.path / "keys.txt").stat().st_size
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.memory.stats(), "disk_rows": len(self._rows), "disk_hits": self.disk_hits}
@@ -0,0 +1,54 @@
+"""
+Array-backed grounded-fact storage for the character grounder.
+
+A grounding result keeps the grounded character positions (``int32``), their token
+ids (``int32``) and scores (``float32``) as three arrays instead of one dict per
+grounded character. Dicts are only materialized on demand, e.g. for the checker.
+"""
+from typing import Any, Dict, Iterator, List
+import numpy as np
+
+TOKEN_MIN, TOKEN_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+class GroundedFacts:
+    __slots__ = ("positions", "tokens", "scores")
+
+    def __init__(self, positions, tokens, scores):
+        self.positions = np.asarray(positions, dtype=np.int32)
+        self.tokens = np.asarray(tokens, dtype=np.int32)
+        self.scores = np.asarray(scores, dtype=np.float32)
+
+    @classmethod
+    def empty(cls) -> "GroundedFacts":
+        return cls([], [], [])
+
+    @classmethod
+    def concat(cls, parts: List["GroundedFacts"]) -> "GroundedFacts":
+        if not parts:
+            return cls.empty()
+        return cls(np.concatenate([p.positions for p in parts]), np.concatenate([p.tokens for p in parts]),
+                   np.concatenate([p.scores for p in parts]))
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, idx: int) -> Dict[str, Any]:
+        return {"token": int(self.tokens[idx]), "score": float(self.scores[idx])}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for t, s in zip(self.tokens.tolist(), self.scores.tolist()):
+            yield {"token": t, "score": s}
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def nbytes(self) -> int:
+        return self.positions.nbytes + self.tokens.nbytes + self.scores.nbytes
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for k, v in state.items():
+            setattr(self, k, v)
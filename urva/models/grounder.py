@@ -1,57 +1,169 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
 import torch
 from torch import nn
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
 import numpy as np
 
-try:
-    from sentence_transformers import SentenceTransformer
-    _SBERT_AVAILABLE = True
-except ImportError:
-    _SBERT_AVAILABLE = False
+from urva.models.embedding_cache import EmbeddingCache
+from urva.models.grounded import TOKEN_MAX, TOKEN_MIN, GroundedFacts
+from urva.models.sbert import DEFAULT_SBERT_MODEL, load_sbert
+from urva.utils.device import module_device
+
+
+class GrounderCore(nn.Module):
+    """
+    Tensor-only part of ``FactGrounder``: packed GRU pass and per-character scores for a
+    padded batch, with an optional carried hidden state. Scriptable (``urva.core.export``).
+    """
+
+    def __init__(self, grounder: "FactGrounder"):
+        super().__init__()
+        self.encoder = grounder.encoder
+        self.scorer = grounder.scorer
+
+    def forward(self, emb: torch.Tensor, lengths: torch.Tensor,
+                h0: Optional[torch.Tensor] = None) -> Tuple[torch.Tensor, torch.Tensor]:
+        packed = pack_padded_sequence(emb, lengths, batch_first=True, enforce_sorted=False)
+        out, h_n = self.encoder(packed, h0)
+        out, _ = pad_packed_sequence(out, batch_first=True)
+        return torch.sigmoid(self.scorer(out)).squeeze(-1), h_n
 
 
 class FactGrounder(nn.Module):
     def __init__(self, cfg: Dict[str, Any]):
         super().__init__()
         self.hidden = cfg.get("hidden_size", 128)
-        self.threshold = cfg.get("grounder", {}).get("threshold", 0.45)
+        grounder_cfg = cfg.get("grounder", {})
+        self.threshold = grounder_cfg.get("threshold", 0.45)
+        self.encode_batch_size = grounder_cfg.get("encode_batch_size", 64)
+        # characters per GRU pass (None = whole text) and an optional hard input cap
+        self.window = grounder_cfg.get("window")
+        self.max_length = grounder_cfg.get("max_length")
         self.encoder = nn.GRU(input_size=self.hidden, hidden_size=self.hidden, batch_first=True)
         self.scorer = nn.Linear(self.hidden, 1)
-        # SBERT for semantic grounding (paper Section II-C)
-        self.sbert = SentenceTransformer('all-MiniLM-L6-v2') if _SBERT_AVAILABLE else None
+        # SBERT for semantic grounding (paper Section II-C), loaded on first use
+        self.sbert_cfg = {"model": DEFAULT_SBERT_MODEL, **grounder_cfg.get("sbert", {})}
+        self.embedding_cache = EmbeddingCache(**grounder_cfg.get("embedding_cache", {}),
+                                              model=self.sbert_cfg.get("path") or self.sbert_cfg["model"])
+
+    @property
+    def sbert(self):
+        """Shared process-wide model (not a submodule, so never part of the state dict)."""
+        return load_sbert(**self.sbert_cfg)
+
+    def load_state_dict(self, state_dict, strict: bool = True):
+        # checkpoints from before the shared registry carried the SBERT weights
+        state_dict = {k: v for k, v in state_dict.items() if not k.startswith("sbert.")}
+        return super().load_state_dict(state_dict, strict=strict)
 
     def compute_grounding(self, prediction: str, context: str) -> float:
         """Hybrid grounding G = 0.5*lexical + 0.5*semantic (paper Eq. αF+βG)"""
-        pred_tok = set(prediction.lower().split())
-        ctx_tok = set(context.lower().split())
-        lexical = len(pred_tok & ctx_tok) / max(len(ctx_tok), 1)
-        if self.sbert:
-            embs = self.sbert.encode([prediction, context])
-            sem = float(np.dot(embs[0], embs[1]) /
-                        (np.linalg.norm(embs[0]) * np.linalg.norm(embs[1]) + 1e-8))
-            sem = max(0.0, sem)
+        return self.compute_grounding_batch([prediction], [context])[0]
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """SBERT embeddings of distinct ``texts``; only cache misses are encoded, in one call."""
+        embs = self.embedding_cache.get_many(texts)
+        missing = [i for i, e in enumerate(embs) if e is None]
+        if missing:
+            fresh = np.asarray(
+                self.sbert.encode([texts[i] for i in missing], batch_size=self.encode_batch_size,
+                                  convert_to_numpy=True),
+                dtype=np.float32,
+            )
+            self.embedding_cache.put_many([texts[i] for i in missing], fresh)
+            for i, emb in zip(missing, fresh):
+                embs[i] = emb
+        return np.stack(embs)
+
+    def compute_grounding_batch(self, predictions: List[str], contexts: List[str]) -> List[float]:
+        """``compute_grounding`` for aligned lists: one deduplicated encode, vectorized cosines."""
+        lexical = np.zeros(len(predictions))
+        for i, (prediction, context) in enumerate(zip(predictions, contexts)):
+            pred_tok = set(prediction.lower().split())
+            ctx_tok = set(context.lower().split())
+            lexical[i] = len(pred_tok & ctx_tok) / max(len(ctx_tok), 1)
+        if self.sbert and len(predictions):
+            unique = list(dict.fromkeys([*predictions, *contexts]))
+            index = {t: i for i, t in enumerate(unique)}
+            embs = self._embed(unique)
+            a = embs[[index[t] for t in predictions]]
+            b = embs[[index[t] for t in contexts]]
+            sem = np.einsum("ij,ij->i", a, b) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1) + 1e-8)
+            sem = np.maximum(sem, 0.0)
         else:
-            sem = lexical  
-        return 0.5 * lexical + 0.5 * sem
+            sem = lexical
+        return (0.5 * lexical + 0.5 * sem).tolist()
 
-    def _encode_tokens(self, tokens: List[int]) -> torch.Tensor:
+    def _token_rng(self, tokens: np.ndarray) -> torch.Generator:
         rng = torch.Generator()
-        rng.manual_seed(sum(tokens) + len(tokens))
-        device = self.encoder.weight_ih_l0.device
-        return torch.randn(1, len(tokens), self.hidden, generator=rng, device=device)
-
-    def ground_tokens(self, tokens: List[int]) -> Dict[str, Any]:
-        if not tokens:
-            return {"grounded_facts": [], "avg_score": 0.0}
-        embeddings = self._encode_tokens(tokens)
-        out, _ = self.encoder(embeddings)
-        scores = torch.sigmoid(self.scorer(out)).squeeze(-1)[0]
-        mask = scores > self.threshold
-        grounded = [{"token": t, "score": float(s.detach())}
-                    for t, s, m in zip(tokens, scores, mask) if m]
-        return {"grounded_facts": grounded, "avg_score": float(scores.mean().detach())}
+        rng.manual_seed(int(tokens.sum()) + len(tokens))
+        return rng
+
+    def ground_tokens(self, tokens: Sequence[int]) -> Dict[str, Any]:
+        return self.ground_tokens_batch([tokens])[0]
+
+    def core(self) -> GrounderCore:
+        # built around the live layers on each call, so it follows load_state_dict/quantization
+        return GrounderCore(self)
+
+    def ground_tokens_batch(self, token_lists: Sequence[Sequence[int]],
+                            core: Optional[Callable[..., Tuple[torch.Tensor, torch.Tensor]]] = None
+                            ) -> List[Dict[str, Any]]:
+        """
+        Packs all non-empty token sequences and runs the GRU once per window for the whole
+        batch. With ``window`` set, sequences are fed ``window`` characters at a time with
+        the hidden state carried over, so memory stays flat for very long inputs; the
+        per-sequence embedding stream is drawn window by window from the same generator.
+        ``core`` swaps in another implementation of ``GrounderCore``, e.g. a scripted export.
+        """
+        results = [{"grounded_facts": GroundedFacts.empty(), "avg_score": 0.0} for _ in token_lists]
+        active = [i for i, tokens in enumerate(token_lists) if len(tokens)]
+        if not active:
+            return results
+        tokens = [np.asarray(token_lists[i][: self.max_length], dtype=np.int64) for i in active]
+        for t in tokens:
+            if t.min() < TOKEN_MIN or t.max() > TOKEN_MAX:
+                raise ValueError(f"token ids must fit in int32, got values in [{t.min()}, {t.max()}]")
+        lengths = np.array([len(t) for t in tokens])
+        rngs = [self._token_rng(t) for t in tokens]
+        device = module_device(self)
+        window = self.window or int(lengths.max())
+        threshold = np.float32(self.threshold)
+        core = core or self.core()
+        hidden = None
+        parts: List[List[GroundedFacts]] = [[] for _ in active]
+        means: List[List[Tuple[float, int]]] = [[] for _ in active]
+        for start in range(0, int(lengths.max()), window):
+            live = np.nonzero(lengths > start)[0]
+            steps = np.minimum(lengths[live] - start, window)
+            embeddings = torch.zeros(len(live), int(steps.max()), self.hidden, device=device)
+            for row, (b, n) in enumerate(zip(live, steps)):
+                embeddings[row, :n] = torch.randn(int(n), self.hidden, generator=rngs[b], device=device)
+            live_t = torch.as_tensor(live, device=device)
+            scores, h_n = core(embeddings, torch.as_tensor(steps),
+                               None if hidden is None else hidden.index_select(1, live_t))
+            hidden = h_n if hidden is None else hidden.index_copy(1, live_t, h_n)
+            scores = scores.detach()
+            scores_np = scores.cpu().numpy()
+            for row, (b, n) in enumerate(zip(live, steps)):
+                s = scores_np[row, :n]
+                keep = np.nonzero(s > threshold)[0]
+                parts[b].append(GroundedFacts(keep + start, tokens[b][start + keep], s[keep]))
+                means[b].append((float(scores[row, :n].mean()), int(n)))
+        for b, i in enumerate(active):
+            avg = means[b][0][0] if len(means[b]) == 1 else \
+                sum(m * n for m, n in means[b]) / int(lengths[b])
+            results[i] = {"grounded_facts": GroundedFacts.concat(parts[b]), "avg_score": avg}
+        return results
+
+    @staticmethod
+    def _tokenize(text: str) -> np.ndarray:
+        # ord(c) % 97 for every character, without a Python-level loop
+        return np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32) % 97
+
+    def ground_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        return self.ground_tokens_batch([self._tokenize(t) for t in texts])
 
     def __call__(self, batch: Dict[str, Any]) -> Dict[str, Any]:
         text = batch.get("text", "")
-        tokens = [ord(c) % 97 for c in text]
-        return self.ground_tokens(tokens)
+        return self.ground_tokens(self._tokenize(text))
@@ -1,6 +1,50 @@
-from typing import Dict, Any
+import sys
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 import torch
 from torch import nn
+from torch.nn.utils.rnn import pad_sequence
+from urva.utils.device import module_device
+from urva.utils.seed import stable_seed
+
+
+class ReasonerCore(nn.Module):
+    """
+    Tensor-only part of ``MultiHopReasoner``: padded embeddings plus a validity mask in,
+    head logits (direct, justify, verify), confidence scores and hop scores out. No
+    template choice or ``.item()`` syncs, so it can be scripted (``urva.core.export``).
+    ``encode_chunk``/``heads`` split the same computation for streaming long inputs.
+    """
+
+    def __init__(self, reasoner: "MultiHopReasoner"):
+        super().__init__()
+        self.embed = reasoner.embed
+        self.proj = reasoner.proj
+        self.score_head = reasoner.score_head
+        self.direct_head = reasoner.direct_head
+        self.justify_head = reasoner.justify_head
+        self.verify_head = reasoner.verify_head
+
+    def forward(self, emb: torch.Tensor, mask: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        out, _ = self.embed(emb)
+        mask = mask.to(out.dtype)
+        out_sum = (out * mask.unsqueeze(-1)).sum(dim=1)
+        hop_sum = (torch.sigmoid(out.mean(dim=2)) * mask).sum(dim=1)
+        return self.heads(out_sum, hop_sum, mask.sum(dim=1))
+
+    @torch.jit.export
+    def encode_chunk(self, emb: torch.Tensor,
+                     h0: Optional[torch.Tensor] = None) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """GRU over one unpadded chunk: running sums for pooling plus the hidden state to carry."""
+        out, h_n = self.embed(emb, h0)
+        return out.sum(dim=1), torch.sigmoid(out.mean(dim=2)).sum(dim=1), h_n
+
+    @torch.jit.export
+    def heads(self, out_sum: torch.Tensor, hop_sum: torch.Tensor,
+              lengths: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        pooled = torch.relu(self.proj(out_sum / lengths[:, None]))
+        logits = torch.cat([self.direct_head(pooled), self.justify_head(pooled), self.verify_head(pooled)], dim=1)
+        scores = torch.sigmoid(self.score_head(pooled)).squeeze(-1)
+        return logits, scores, hop_sum / lengths
 
 
 class MultiHopReasoner(nn.Module):
@@ -13,6 +57,8 @@ class MultiHopReasoner(nn.Module):
         super().__init__()
         self.cfg = cfg
         self.hidden = cfg.get("hidden_size", 128)
+        # characters per GRU pass; longer texts are streamed in chunks (None = never)
+        self.max_context = cfg.get("reasoner", {}).get("max_context", 4096)
         self.embed = nn.GRU(
             input_size=self.hidden, hidden_size=self.hidden, batch_first=True
         )
@@ -46,42 +92,115 @@ class MultiHopReasoner(nn.Module):
         if not text:
             return torch.zeros((1, 1, self.hidden))
         rng = torch.Generator()
-        rng.manual_seed(abs(hash(text)) % (2**31 - 1))
+        rng.manual_seed(stable_seed(text))
         base = torch.randn((1, len(text), self.hidden), generator=rng)
         return base
 
-    def _pick(self, logits: torch.Tensor, bank: list[str]) -> str:
-        score = torch.sigmoid(logits).item()
-        idx = int(score * len(bank)) % len(bank)
-        return bank[idx]
+    def _is_long(self, text: str) -> bool:
+        return bool(self.max_context) and len(text) > self.max_context
+
+    def _encode_chunks(self, text: str) -> Iterator[torch.Tensor]:
+        """
+        ``_encode_text`` drawn ``max_context`` characters at a time from the same generator,
+        so the concatenated chunks equal the full encoding without ever allocating it.
+        """
+        rng = torch.Generator()
+        rng.manual_seed(stable_seed(text))
+        for start in range(0, len(text), self.max_context):
+            n = min(self.max_context, len(text) - start)
+            yield torch.randn((1, n, self.hidden), generator=rng)
+
+    def _stream(self, text: str, core, device: torch.device,
+                perturb: Optional[Callable[[torch.Tensor], torch.Tensor]] = None
+                ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Chunked ``core(emb, mask)`` for one long text: hidden state and pooling sums carry
+        over. ``perturb`` may widen each (1, n, hidden) chunk into a batch of variants.
+        """
+        out_sum = hop_sum = h = None
+        for emb in self._encode_chunks(text):
+            if perturb is not None:
+                emb = perturb(emb)
+            o, p, h = core.encode_chunk(emb.to(device), h)
+            out_sum = o if out_sum is None else out_sum + o
+            hop_sum = p if hop_sum is None else hop_sum + p
+        return core.heads(out_sum, hop_sum, torch.full((out_sum.size(0),), float(len(text)), device=device))
+
+    def _encode_batch(self, texts: List[str]) -> Tuple[torch.Tensor, torch.Tensor]:
+        embs = [self._encode_text(t)[0] for t in texts]
+        lengths = torch.tensor([e.size(0) for e in embs])
+        return pad_sequence(embs, batch_first=True), lengths
 
     def forward(self, batch: Dict[str, Any]) -> Dict[str, Any]:
-        text = batch.get("text", "")
-        emb = self._encode_text(text)
-        emb = emb.to(next(self.parameters()).device)
-        out, _ = self.embed(emb)
-        pooled = out.mean(dim=1)
-        pooled = torch.relu(self.proj(pooled))
-
-        d = self.direct_head(pooled)
-        j = self.justify_head(pooled)
-        v = self.verify_head(pooled)
-        score = torch.sigmoid(self.score_head(pooled)).mean()
-
-        s1 = self._pick(d, self.templates_direct)
-        s2 = "Explanation: " + self._pick(j, self.templates_justify)
-        s3 = "Verification: " + self._pick(v, self.templates_verify)
-
-        hop_scores = torch.sigmoid(out.mean(dim=2)).mean(dim=1)
-
-        return {
-            "S1": s1,
-            "S2": s2,
-            "S3": s3,
-            "hop_scores": [float(hop_scores.mean().detach())],
-            "score_tensor": score,
-            "final_score": float(score.detach()),
-        }
+        # one code path: a single text is a batch of one
+        return self.forward_batch([batch.get("text", "")])[0]
+
+    def core(self) -> ReasonerCore:
+        # built around the live layers on each call, so it follows load_state_dict/quantization
+        return ReasonerCore(self)
+
+    def _states(self, logits: torch.Tensor, scores: torch.Tensor, hop_scores: torch.Tensor) -> List[Dict[str, Any]]:
+        """Template choice for a whole batch, from one tensor-to-list transfer."""
+        rows = torch.cat([torch.sigmoid(logits), scores[:, None], hop_scores[:, None]], dim=1).detach().tolist()
+        banks = (self.templates_direct, self.templates_justify, self.templates_verify)
+        states = []
+        for i, (d, j, v, score, hop) in enumerate(rows):
+            s1, s2, s3 = (bank[int(p * len(bank)) % len(bank)] for p, bank in zip((d, j, v), banks))
+            states.append({
+                "S1": s1,
+                # interned: every result holding the same template shares one string
+                "S2": sys.intern("Explanation: " + s2),
+                "S3": sys.intern("Verification: " + s3),
+                "hop_scores": [hop],
+                "score_tensor": scores[i],
+                "final_score": score,
+            })
+        return states
+
+    def forward_batch(self, texts: List[str], core: Optional[ReasonerCore] = None) -> List[Dict[str, Any]]:
+        """
+        Pads every text to the longest one, runs the GRU once, mean-pools over the valid
+        (unpadded) positions only and evaluates all heads for the batch at once. Texts
+        longer than ``max_context`` are streamed one by one instead, so they never set the
+        padded width.
+        ``core`` swaps in another implementation of ``ReasonerCore``, e.g. a scripted export.
+        """
+        if not texts:
+            return []
+        device = module_device(self)
+        core = core or self.core()
+        states: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        short = [i for i, t in enumerate(texts) if not self._is_long(t)]
+        if short:
+            emb, lengths = self._encode_batch([texts[i] for i in short])
+            mask = torch.arange(emb.size(1))[None, :] < lengths[:, None]
+            for i, state in zip(short, self._states(*core(emb.to(device), mask.to(device)))):
+                states[i] = state
+        for i, text in enumerate(texts):
+            if states[i] is None:
+                states[i] = self._states(*self._stream(text, core, device))[0]
+        return states
+
+    def forward_candidates(self, text: str, k: int, noise: float,
+                           core: Optional[ReasonerCore] = None) -> List[Dict[str, Any]]:
+        """
+        Self-consistency: ``k`` candidate state sets for one text from ``k`` perturbed
+        copies of its encoding (Gaussian noise of scale ``noise``, seeded by the text),
+        evaluated as a single batch.
+        """
+        device = module_device(self)
+        core = core or self.core()
+        rng = torch.Generator()
+        rng.manual_seed(stable_seed("self-consistency\x1f" + text))
+
+        def perturb(emb: torch.Tensor) -> torch.Tensor:
+            return emb + noise * torch.randn((k, emb.size(1), self.hidden), generator=rng)
+
+        if self._is_long(text):
+            return self._states(*self._stream(text, core, device, perturb))
+        emb = perturb(self._encode_text(text)).to(device)
+        mask = torch.ones(emb.shape[:2], dtype=torch.bool, device=device)
+        return self._states(*core(emb, mask))
 
     def reason(self, hop_embeddings):
         # Compatibility shim; ignore hop embeddings and regenerate
@@ -0,0 +1,54 @@
+"""
+Process-wide SentenceTransformer registry.
+
+Models load on first use, once per process, and are shared by every grounder that
+asks for the same (model, path, offline, device). Loading before a fork lets pool
+workers share the weights copy-on-write instead of each reading its own copy.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_SBERT_MODEL = "all-MiniLM-L6-v2"
+
+_MODELS: Dict[Tuple[str, Optional[str], bool, Optional[str]], Any] = {}
+_STATS: Dict[Tuple[str, Optional[str], bool, Optional[str]], Dict[str, Any]] = {}
+_LOCK = threading.Lock()
+
+
+def load_sbert(model: str = DEFAULT_SBERT_MODEL, path: Optional[str] = None, offline: bool = False,
+               device: Optional[str] = None):
+    """
+    Return the shared SentenceTransformer for ``model``, loading it on the first call.
+
+    ``path`` points at a local copy of the model and takes precedence over the hub
+    name. With ``offline`` the hub is never contacted: ``path`` (or ``model``) must
+    be a local model directory. Returns None when sentence-transformers or the model
+    is unavailable; the failure is recorded in ``sbert_stats``.
+    """
+    key = (model, path, offline, device)
+    with _LOCK:
+        if key not in _MODELS:
+            t0 = time.perf_counter()
+            stats: Dict[str, Any] = {"model": model, "path": path, "offline": offline, "error": None}
+            try:
+                # a local directory is loaded without touching the hub
+                if offline and not os.path.isdir(path or model):
+                    raise FileNotFoundError(f"offline mode needs a local model directory, got {path or model!r}")
+                from sentence_transformers import SentenceTransformer
+                kwargs = {"device": device} if device else {}
+                _MODELS[key] = SentenceTransformer(path or model, **kwargs)
+            except Exception as exc:
+                _MODELS[key] = None
+                stats["error"] = f"{type(exc).__name__}: {exc}"
+            stats["load_seconds"] = time.perf_counter() - t0
+            stats["pid"] = os.getpid()
+            _STATS[key] = stats
+        return _MODELS[key]
+
+
+def sbert_stats() -> Dict[str, Dict[str, Any]]:
+    """Load time, source and error of every model this process has tried to load."""
+    with _LOCK:
+        return {"|".join(str(part) for part in key): dict(stats) for key, stats in _STATS.items()}
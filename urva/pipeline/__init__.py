@@ -1,3 +1,6 @@
 from .inference import InferencePipeline
+from .formatting import format_output
+from .result import InferenceResult
+from .stage_cache import StageCache
 
-__all__ = ["InferencePipeline"]
+__all__ = ["InferencePipeline", "InferenceResult", "format_output", "StageCache"]
@@ -0,0 +1,11 @@
+def format_output(out):
+    lines = [
+        f"Final Answer: {out.get('final_answer','')}",
+        f"Summary: {out.get('summary','')}",
+        f"Certainty: {out['fusion'].get('certainty',0):.3f}",
+        f"Reasoning Confidence: {out['fusion'].get('reasoning_alignment',0):.3f}",
+        f"Conflict Score: {out['fusion'].get('conflict_score',0):.3f}",
+        f"Logic Violations: {len(out.get('hallucination',{}).get('violations',[]))}",
+        f"Hallucination Type: {out.get('hallucination',{}).get('type','NONE')}",
+    ]
+    return "\n".join(lines)
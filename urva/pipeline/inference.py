@@ -2,15 +2,34 @@ import math
 from typing import Dict, Any, List, Tuple
 import torch
 import numpy as np
+from urva.utils.seed import stable_seed
+from urva.pipeline.stage_cache import hash_config
+from urva.graph.relations import CONTRADICTION, ENTAILMENT, classify_pairs, negation_flags
+from urva.graph.lsh import approximate_relations
+from urva.graph.edges import EdgeTable
+from urva.logic.context import StateAnalysis
+from urva.pipeline.result import InferenceResult
 
 
 class InferencePipeline:
-    def __init__(self, grounder, reasoner, checker, cfg, logic):
+    # max |run_batch - run| of any float in a result (about 1e-7 observed)
+    BATCH_TOLERANCE = 1e-6
+
+    def __init__(self, grounder, reasoner, checker, cfg, logic, cache=None):
         self.grounder = grounder
         self.reasoner = reasoner
         self.checker = checker
         self.cfg = cfg
         self.logic = logic
+        self.cache = cache
+        hidden = cfg.get("hidden_size", 128)
+        # quantized weights give (slightly) different outputs than the fp32 ones they came from
+        quant = {"quantize": cfg["quantize"]} if cfg.get("quantize") else {}
+        self._stage_hashes = {
+            "reasoner": hash_config({"hidden_size": hidden, "reasoner": cfg.get("reasoner", {}), **quant}),
+            "grounder": hash_config({"hidden_size": hidden, "grounder": cfg.get("grounder", {}), **quant}),
+            "graph": hash_config({"hidden_size": hidden, "graph": cfg.get("graph", {})}),
+        }
         self.speed_profiles = {
             "aggressive": {"refine": 0, "conflict_threshold": 0.35},
             "balanced":   {"refine": 0, "conflict_threshold": 0.25},
@@ -18,68 +37,196 @@ class InferencePipeline:
         }
 
     def run(self, item: Dict[str, Any], speed: str = "balanced", debug: bool = False, ablation: str | None = None):
+        return self.run_batch([item], speed=speed, debug=debug, ablation=ablation)[0]
+
+    def run_batch(self, items: List[Dict[str, Any]], speed: str = "balanced", debug: bool = False,
+                  ablation: str | None = None) -> List[InferenceResult]:
+        """
+        Batched ``run``: the reasoner and grounder GRUs run once over the padded batch,
+        the logic rules parse every state of the batch in one ``nlp.pipe`` stream, and the
+        per-item stages (graph, refinement, fusion) then run item by item, with the SBERT
+        faithfulness term of every chosen answer computed in one grounding batch. Runs
+        under ``torch.inference_mode``, so no autograd state is recorded or kept.
+
+        Per item, results match ``run`` except in the last float32 bits: BLAS picks
+        different kernels for padded batch shapes, so ``final_score``, ``hop_scores`` and
+        ``certainty`` may differ by up to ``BATCH_TOLERANCE``. Texts, templates and
+        verdicts are identical.
+        """
+        if not items:
+            return []
+        with torch.inference_mode():
+            return self._run_batch(items, speed, debug, ablation)
+
+    def _run_batch(self, items: List[Dict[str, Any]], speed: str, debug: bool,
+                   ablation: str | None) -> List[InferenceResult]:
+        texts = [item["text"] for item in items]
+        if ablation == "reasoner":
+            initial = [self._direct_states(text) for text in texts]
+        else:
+            initial = self._reason_batch(texts)
+        if ablation == "grounder":
+            groundings = [{"grounded_facts": [], "avg_score": 0.0} for _ in texts]
+        else:
+            groundings = self._ground_batch(texts)
+        if ablation == "logic":
+            analyses = [None] * len(items)
+        else:
+            analyses = self._analyze_batch(initial)
+        chosen = [
+            self._refine(item, states, analysis, speed, ablation)
+            for item, states, analysis in zip(items, initial, analyses)
+        ]
+        faithfulness = self._faithfulness_batch([c[0] for c in chosen], texts, groundings)
+        return [
+            self._finalize(item, states, graph, analysis, grounding, f, speed, debug, ablation)
+            for item, (states, graph, analysis), grounding, f in zip(items, chosen, groundings, faithfulness)
+        ]
+
+    def _direct_states(self, text: str) -> Dict[str, Any]:
+        return {
+            "S1": f"Direct: {text}",
+            "S2": "",
+            "S3": "",
+            "hop_scores": [0.0],
+            "score_tensor": torch.tensor(0.0),
+            "final_score": 0.0,
+        }
+
+    # ----------------- Stage cache -----------------
+    def _logic_hash(self) -> str:
+        # computed per lookup: rules can be (un)registered on the engine at runtime
+        if hasattr(self.logic, "cache_identity"):
+            return hash_config(self.logic.cache_identity())
+        return hash_config(getattr(self.logic, "rules", None))
+
+    def _cached_batch(self, stage: str, texts: List[str], compute, with_checkpoint: bool = False) -> List[Any]:
+        """Look every text up in the stage cache and compute only the misses, in one call."""
+        if self.cache is None:
+            return compute(texts)
+        config_hash = self._logic_hash() if stage == "logic" else self._stage_hashes[stage]
+        keys = [self.cache.key(stage, t, config_hash, with_checkpoint) for t in texts]
+        results = [self.cache.get(k) for k in keys]
+        missing = [i for i, r in enumerate(results) if r is self.cache.MISS]
+        if missing:
+            fresh = compute([texts[i] for i in missing])
+            for i, value in zip(missing, fresh):
+                self.cache.put(keys[i], stage, value)
+                results[i] = value
+        return results
+
+    def _reason_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        def compute(batch: List[str]) -> List[Dict[str, Any]]:
+            if hasattr(self.reasoner, "forward_batch"):
+                return self.reasoner.forward_batch(batch)
+            return [self.reasoner({"text": text}) for text in batch]
+        return self._cached_batch("reasoner", texts, compute, with_checkpoint=True)
+
+    def _ground_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        def compute(batch: List[str]) -> List[Dict[str, Any]]:
+            if hasattr(self.grounder, "ground_batch"):
+                return self.grounder.ground_batch(batch)
+            return [self.grounder({"text": text}) for text in batch]
+        return self._cached_batch("grounder", texts, compute, with_checkpoint=True)
+
+    def _faithfulness_batch(self, states_list: List[Dict[str, Any]], texts: List[str],
+                            groundings: List[Dict[str, Any]]) -> List[float]:
+        """F = grounding of each chosen S1 against its input text, one SBERT batch for all items."""
+        answers = [states.get("S1", "") for states in states_list]
+        if hasattr(self.grounder, "compute_grounding_batch"):
+            return self.grounder.compute_grounding_batch(answers, texts)
+        if hasattr(self.grounder, "compute_grounding"):
+            return [self.grounder.compute_grounding(a, t) for a, t in zip(answers, texts)]
+        return [g.get("avg_score", 0.0) for g in groundings]
+
+    def _profile(self, speed: str, ablation: str | None) -> Dict[str, Any]:
         profile = self.speed_profiles.get(speed, self.speed_profiles["balanced"])
-        text = item["text"]
         if ablation == "refiner":
             profile = {**profile, "refine": 0}
+        sc = self.cfg.get("self_consistency", {})
+        if sc.get("enabled") and speed in sc.get("speeds", ["deep"]) and ablation not in ("refiner", "reasoner"):
+            profile = {**profile, "self_consistency": sc}
+        return profile
+
+    def _reason_candidates(self, text: str, k: int, noise: float) -> List[Dict[str, Any]]:
+        """K self-consistency candidates from one batched reasoner call; cached per text."""
+        def compute(batch: List[str]) -> List[List[Dict[str, Any]]]:
+            if hasattr(self.reasoner, "forward_candidates"):
+                return [self.reasoner.forward_candidates(text, k, noise)]
+            return [self._reason_batch([text + " (re-evaluated)"])]
+        key = f"{text}\x1fself-consistency:{k}:{noise}"
+        return self._cached_batch("reasoner", [key], compute, with_checkpoint=True)[0]
+
+    def _refine(self, item: Dict[str, Any], states: Dict[str, Any], analysis: StateAnalysis | None,
+                speed: str, ablation: str | None) -> Tuple[Dict[str, Any], Dict[str, Any], StateAnalysis | None]:
+        """Refinement loop; returns the chosen (states, conflict graph, analysis)."""
+        profile = self._profile(speed, ablation)
+        text = item["text"]
 
         best_states = None
         best_graph = None
         best_logic = None
+        best_analysis = None
         best_conflict = 1.0
 
-        # initial generation
-        if ablation == "reasoner":
-            states = {
-                "S1": f"Direct: {text}",
-                "S2": "",
-                "S3": "",
-                "hop_scores": [0.0],
-                "score_tensor": torch.tensor(0.0),
-                "final_score": 0.0,
-            }
-        else:
-            states = self.reasoner({"text": text})
-            if ablation == "reasoner":
-                states["S1"] = f"Direct: {text}"
-        graph = self._build_conflict_graph(states)
-        logic_violations = [] if ablation == "logic" else self._logic_violations(states)
-        best_states, best_graph, best_logic, best_conflict = states, graph, logic_violations, graph["conflict_score"]
+        graph = self._conflict_graph(states)
+        logic_violations = analysis.violations if analysis else []
+        best_states, best_graph, best_logic, best_analysis, best_conflict = (
+            states, graph, logic_violations, analysis, graph["conflict_score"]
+        )
 
+        sc = profile.get("self_consistency")
+        if sc and (graph["conflict_score"] > profile["conflict_threshold"] or logic_violations):
+            # all K candidates scored together: one reasoner batch, one rules stream
+            candidates = self._reason_candidates(text, int(sc.get("k", 4)), float(sc.get("noise", 0.1)))
+            graphs = self._conflict_graphs(candidates)
+            analyses = [None] * len(candidates) if ablation == "logic" else self._analyze_batch(candidates)
+            for states_c, graph_c, analysis_c in zip(candidates, graphs, analyses):
+                logic_c = analysis_c.violations if analysis_c else []
+                score_c = graph_c["conflict_score"] + 0.05 * len(logic_c)
+                if score_c < best_conflict + 0.05 * len(best_logic):
+                    best_states, best_graph, best_logic, best_analysis, best_conflict = (
+                        states_c,
+                        graph_c,
+                        logic_c,
+                        analysis_c,
+                        graph_c["conflict_score"],
+                    )
         # refinement loop
-        if ablation != "refiner" and ablation != "reasoner":
+        elif ablation != "refiner" and ablation != "reasoner":
             for _ in range(profile["refine"]):
                 if graph["conflict_score"] <= profile["conflict_threshold"] and not logic_violations:
                     break
-                states_candidate = self.reasoner({"text": text + " (re-evaluated)"})
-                graph_c = self._build_conflict_graph(states_candidate)
-                logic_c = [] if ablation == "logic" else self._logic_violations(states_candidate)
+                states_candidate = self._reason_batch([text + " (re-evaluated)"])[0]
+                graph_c = self._conflict_graph(states_candidate)
+                analysis_c = None if ablation == "logic" else self._analyze_states(states_candidate)
+                logic_c = analysis_c.violations if analysis_c else []
                 score_c = graph_c["conflict_score"] + 0.05 * len(logic_c)
                 if score_c < best_conflict + 0.05 * len(best_logic):
-                    best_states, best_graph, best_logic, best_conflict = (
+                    best_states, best_graph, best_logic, best_analysis, best_conflict = (
                         states_candidate,
                         graph_c,
                         logic_c,
+                        analysis_c,
                         graph_c["conflict_score"],
                     )
                 graph, logic_violations = graph_c, logic_c
 
-        # chosen outputs
-        states = best_states
-        graph = best_graph
-        logic_violations = best_logic
+        return best_states, best_graph, best_analysis
+
+    def _finalize(self, item: Dict[str, Any], states: Dict[str, Any], graph: Dict[str, Any],
+                  analysis: StateAnalysis | None, grounding: Dict[str, Any], faithfulness: float,
+                  speed: str, debug: bool, ablation: str | None) -> InferenceResult:
+        profile = self._profile(speed, ablation)
+        text = item["text"]
+        logic_violations = analysis.violations if analysis else []
 
-        if ablation == "grounder":
-            grounding = {"grounded_facts": [], "avg_score": 0.0}
-        else:
-            grounding = self.grounder({"text": text})
         reasoning = {
             "S1": states.get("S1", ""),
             "S2": states.get("S2", ""),
             "S3": states.get("S3", ""),
             "hop_scores": states.get("hop_scores", []),
-            "score_tensor": states.get("score_tensor", 0),
-            "final_score": states.get("final_score", 0),
+            "final_score": float(states.get("final_score", 0)),
         }
 
         if ablation == "logic":
@@ -93,42 +240,34 @@ class InferencePipeline:
             halluc = self.checker.run_all(
                 {"S1": reasoning["S1"], "S2": reasoning["S2"], "S3": reasoning["S3"]},
                 conflict_score=graph["conflict_score"],
+                violations=logic_violations,
             )
 
         # F = avg grounded score, G = conflict-based grounding, L = normalized violations
-         _F = self.grounder.compute_grounding(states.get("S1", ""), text) \
-             if hasattr(self.grounder, "compute_grounding") else grounding.get("avg_score", 0.0)
+        _F = faithfulness
         _G = grounding.get("avg_score", 0.0)
         _L = min(len(logic_violations) / 5, 1.0)
         certainty = self._certainty(_F, _G, _L)
 
-        fusion = {
-            "conflict_score": graph["conflict_score"],
-            "rule_violations": logic_violations,
-            "reasoning_alignment": reasoning["final_score"],
-            "certainty": certainty,
-            "context_match": text,
-        }
-
-        natural_answer = self._naturalize(states, text, refined=profile["refine"] > 0 and (graph["conflict_score"] > profile["conflict_threshold"] or logic_violations))
-        summary = self._summarize(states, text, refined=profile["refine"] > 0 and (graph["conflict_score"] > profile["conflict_threshold"] or logic_violations))
+        refined = profile["refine"] > 0 or "self_consistency" in profile
+        natural_answer = self._naturalize(states, text, refined=refined and (graph["conflict_score"] > profile["conflict_threshold"] or logic_violations))
+        summary = self._summarize(states, text, refined=refined and (graph["conflict_score"] > profile["conflict_threshold"] or logic_violations))
         evidence = self._evidence_line(states)
 
-        result = {
-            "id": item.get("id"),
-            "final_answer": natural_answer,
-            "summary": summary,
-            "evidence": evidence,
-            "states": states,
-            "conflict_graph": graph,
-            "grounding": grounding,
-            "reasoning": reasoning,
-            "hallucination": halluc,
-            "fusion": fusion,
-        }
-        if debug:
-            result["logic_violations"] = logic_violations
-        return result
+        return InferenceResult(
+            id=item.get("id"),
+            text=text,
+            final_answer=natural_answer,
+            summary=summary,
+            evidence=evidence,
+            conflict_graph=graph,
+            grounding=grounding,
+            hallucination=halluc,
+            rule_violations=logic_violations,
+            certainty=certainty,
+            debug={"logic_violations": logic_violations, "conflict_edges": graph["edges"].to_dicts()} if debug else None,
+            **reasoning,
+        )
 
     # ----------------- Conflict Graph -----------------
     def _sentence_split(self, text: str) -> List[str]:
@@ -139,25 +278,16 @@ class InferencePipeline:
         if not sent:
             return torch.zeros(self.cfg.get("hidden_size", 128))
         rng = torch.Generator()
-        rng.manual_seed(abs(hash(sent)) % (2**31 - 1))
+        rng.manual_seed(stable_seed(sent))
         return torch.randn(self.cfg.get("hidden_size", 128), generator=rng)
 
-    def _pair_relation(self, a: str, b: str) -> str:
-        ea, eb = self._embed_sentence(a), self._embed_sentence(b)
-        if ea.norm() == 0 or eb.norm() == 0:
-            return "neutral"
-        sim = torch.dot(ea, eb) / (ea.norm() * eb.norm() + 1e-8)
-        sim = float(sim.detach())
-        neg_tokens = {"not", "never", "no", "cannot"}
-        has_neg_a = any(tok in a.lower() for tok in neg_tokens)
-        has_neg_b = any(tok in b.lower() for tok in neg_tokens)
-        if sim > 0.65 and has_neg_a != has_neg_b:
-            return "contradiction"
-        if sim > 0.7:
-            return "entailment"
-        if sim < 0.2 and has_neg_a != has_neg_b:
-            return "contradiction"
-        return "neutral"
+    def _conflict_graph(self, states: Dict[str, Any]) -> Dict[str, Any]:
+        return self._conflict_graphs([states])[0]
+
+    def _conflict_graphs(self, states_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        keys = ["\x1f".join(states.get(k, "") for k in ["S1", "S2", "S3"]) for states in states_list]
+        by_key = dict(zip(keys, states_list))
+        return self._cached_batch("graph", keys, lambda batch: [self._build_conflict_graph(by_key[k]) for k in batch])
 
     def _build_conflict_graph(self, states: Dict[str, Any]) -> Dict[str, Any]:
         sentences = []
@@ -165,34 +295,58 @@ class InferencePipeline:
             txt = states.get(key, "")
             sentences.extend(self._sentence_split(txt))
 
-        edges = []
+        # one embedding per sentence, all pairwise cosines from a single matmul
+        edges = EdgeTable.empty(sentences)
         contradictions = 0
         confirmations = 0
-        for i in range(len(sentences)):
-            for j in range(i + 1, len(sentences)):
-                rel = self._pair_relation(sentences[i], sentences[j])
-                edges.append({"a": sentences[i], "b": sentences[j], "type": rel})
-                if rel == "contradiction":
-                    contradictions += 1
-                elif rel == "entailment":
-                    confirmations += 1
-        total = max(len(edges), 1)
+        total = 1
+        approximate = False
+        if len(sentences) > 1:
+            emb = torch.stack([self._embed_sentence(s) for s in sentences]).numpy()
+            neg = negation_flags(sentences)
+            graph_cfg = self.cfg.get("graph", {})
+            approximate = bool(graph_cfg.get("approximate", False)) and \
+                len(sentences) >= graph_cfg.get("approx_min_sentences", 256)
+            if approximate:
+                approx = approximate_relations(emb, neg, recall=graph_cfg.get("lsh_recall", 0.95),
+                                               sample_size=graph_cfg.get("approx_sample", 4096),
+                                               max_bands=graph_cfg.get("lsh_max_bands", 32))
+                rows, cols, codes = approx["rows"], approx["cols"], approx["codes"]
+                contradictions, confirmations = approx["contradictions"], approx["confirmations"]
+                total = approx["total"]
+            else:
+                rows, cols, codes = classify_pairs(emb, neg)
+                contradictions = int(np.count_nonzero(codes == CONTRADICTION))
+                confirmations = int(np.count_nonzero(codes == ENTAILMENT))
+                total = max(len(codes), 1)
+            edges = EdgeTable(sentences, rows, cols, codes)
         conflict_score = contradictions / total
-        return {
+        graph = {
             "contradictions": contradictions,
             "confirmations": confirmations,
             "total_relations": total,
             "conflict_score": conflict_score,
             "edges": edges,
         }
+        if approximate:
+            graph["approximate"] = True
+            graph["estimated_neutral"] = max(total - contradictions - confirmations, 0)
+        return graph
 
     # ----------------- Logic violations -----------------
-    def _logic_violations(self, states: Dict[str, Any]) -> List[Dict[str, Any]]:
-        violations: List[Dict[str, Any]] = []
-        for key in ["S1", "S2", "S3"]:
-            txt = states.get(key, "")
-            violations.extend(self.logic.apply_rules(txt))
-        return violations
+    def _analyze_states(self, states: Dict[str, Any]) -> StateAnalysis:
+        return self._analyze_batch([states])[0]
+
+    def _analyze_batch(self, states_list: List[Dict[str, Any]]) -> List[StateAnalysis]:
+        """Rules run once per state, all states parsed together; cached per state text."""
+        return StateAnalysis.build_many(
+            self.logic, states_list, lambda texts: self._cached_batch("logic", texts, self._apply_rules_batch)
+        )
+
+    def _apply_rules_batch(self, texts: List[str]) -> List[List[Dict[str, Any]]]:
+        if hasattr(self.logic, "apply_rules_batch"):
+            return self.logic.apply_rules_batch(texts)
+        return [self.logic.apply_rules(t) for t in texts]
 
     # ----------------- Certainty -----------------
     def _certainty(self, faithfulness: float, grounding: float, logic_penalty: float,
@@ -0,0 +1,107 @@
+"""
+Compact per-item pipeline result.
+
+One slotted record per item with plain floats (no tensors, so no autograd graphs) and
+each string stored once: the input text backs ``fusion.context_match`` and the states
+back both ``states`` and ``reasoning``. Read access mirrors the old result dict
+(``out["fusion"]``, ``out.get("hallucination", {})``); sections are built on demand and
+``to_dict()`` returns the full verbose shape.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import torch
+
+_KEYS = ("id", "final_answer", "summary", "evidence", "states", "conflict_graph", "grounding",
+         "reasoning", "hallucination", "fusion")
+
+
+@dataclass(slots=True)
+class InferenceResult:
+    id: Any
+    text: str
+    final_answer: str
+    summary: str
+    evidence: str
+    S1: str
+    S2: str
+    S3: str
+    hop_scores: List[float]
+    final_score: float
+    conflict_graph: Dict[str, Any]
+    grounding: Dict[str, Any]
+    hallucination: Dict[str, Any]
+    rule_violations: List[Dict[str, Any]]
+    certainty: float
+    debug: Optional[Dict[str, Any]] = None
+    _score_tensor: Optional[torch.Tensor] = field(default=None, repr=False, compare=False)
+
+    @property
+    def conflict_score(self) -> float:
+        return self.conflict_graph["conflict_score"]
+
+    @property
+    def score_tensor(self) -> torch.Tensor:
+        """``final_score`` as a 0-d tensor, built on first access and then reused."""
+        if self._score_tensor is None:
+            self._score_tensor = torch.tensor(self.final_score)
+        return self._score_tensor
+
+    def _states(self) -> Dict[str, Any]:
+        return {
+            "S1": self.S1,
+            "S2": self.S2,
+            "S3": self.S3,
+            "hop_scores": self.hop_scores,
+            "score_tensor": self.score_tensor,
+            "final_score": self.final_score,
+        }
+
+    def _fusion(self) -> Dict[str, Any]:
+        return {
+            "conflict_score": self.conflict_score,
+            "rule_violations": self.rule_violations,
+            "reasoning_alignment": self.final_score,
+            "certainty": self.certainty,
+            "context_match": self.text,
+        }
+
+    def keys(self) -> List[str]:
+        return list(_KEYS) + list(self.debug or ())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __contains__(self, key: str) -> bool:
+        return key in _KEYS or key in (self.debug or ())
+
+    def __getitem__(self, key: str) -> Any:
+        if key in ("states", "reasoning"):
+            return self._states()
+        if key == "fusion":
+            return self._fusion()
+        if key in _KEYS:
+            return getattr(self, key)
+        if self.debug and key in self.debug:
+            return self.debug[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The verbose result dict, with one ``score_tensor`` shared by states and reasoning."""
+        states = self._states()
+        return {
+            "id": self.id,
+            "final_answer": self.final_answer,
+            "summary": self.summary,
+            "evidence": self.evidence,
+            "states": states,
+            "conflict_graph": self.conflict_graph,
+            "grounding": self.grounding,
+            "reasoning": dict(states),
+            "hallucination": self.hallucination,
+            "fusion": self._fusion(),
+            **(self.debug or {}),
+        }
@@ -0,0 +1,187 @@
+"""
+Persistent, content-addressed cache for per-stage pipeline results.
+
+Entries are keyed by ``sha256(stage, sha256(input text), config hash, checkpoint hash)``
+and stored in a SQLite file, so every stage result is durable as soon as it is written
+and a killed run resumes from the last committed entry. Total payload size is bounded;
+least recently used entries are evicted first, in bounded batches, down to
+``EVICT_TO`` of the budget. Hits refresh ``last_access`` in memory and are written
+back every ``TOUCH_BATCH`` hits and on ``put``/``flush``/``close``, so reads do not
+each cost a WAL commit; access times lost to a kill only affect eviction order.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from urva.utils.device import detach_tree
+
+_MISS = object()
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_config(cfg: Any) -> str:
+    return hash_text(json.dumps(cfg, sort_keys=True, default=str))
+
+
+def hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def hash_modules(modules: Iterable[Any]) -> str:
+    """Fingerprint of module weights, used when no checkpoint file identifies them."""
+    h = hashlib.sha256()
+    for module in modules:
+        if module is None or not hasattr(module, "state_dict"):
+            continue
+        for name, tensor in module.state_dict().items():
+            h.update(name.encode("utf-8"))
+            h.update(tensor.detach().cpu().contiguous().numpy().tobytes())
+    return h.hexdigest()
+
+
+class StageCache:
+    MISS = _MISS
+    TOUCH_BATCH = 256
+    EVICT_TO = 0.9
+    EVICT_CHUNK = 256
+
+    def __init__(self, path: str, max_bytes: int = 1 << 30, checkpoint_hash: str = ""):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.checkpoint_hash = checkpoint_hash
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+        # payload bytes in the table: read when the connection opens, then tracked on writes
+        self._total = 0
+        self._touched: Dict[str, float] = {}
+        self._pending_hits = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # SQLite handles must not cross fork(); reopen in each worker process.
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(str(self.path / "stages.sqlite"), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, stage TEXT, size INTEGER, last_access REAL, value BLOB)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_access)")
+            self._conn.commit()
+            self._pid = os.getpid()
+            self._total = self._stored_bytes()
+            self._touched, self._pending_hits = {}, 0
+        return self._conn
+
+    def _stored_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def key(self, stage: str, text: str, config_hash: str, with_checkpoint: bool = True) -> str:
+        ckpt = self.checkpoint_hash if with_checkpoint else ""
+        return hash_text("\x1f".join([stage, hash_text(text), config_hash, ckpt]))
+
+    def get(self, key: str, default: Any = _MISS) -> Any:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self._touched[key] = time.time()
+            self._pending_hits += 1
+            if self._pending_hits >= self.TOUCH_BATCH:
+                self._write_touched()
+                self.conn.commit()
+            self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key: str, stage: str, value: Any) -> None:
+        blob = pickle.dumps(detach_tree(value), protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            conn = self.conn
+            self._write_touched()
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, stage, size, last_access, value) VALUES (?, ?, ?, ?, ?)",
+                (key, stage, len(blob), time.time(), blob),
+            )
+            self._total += len(blob) - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+            conn.commit()
+
+    def _write_touched(self) -> None:
+        if self._touched:
+            self.conn.executemany("UPDATE entries SET last_access = ? WHERE key = ?",
+                                  [(ts, key) for key, ts in self._touched.items()])
+        self._touched = {}
+        self._pending_hits = 0
+
+    def _evict(self) -> None:
+        # other processes sharing the file may have written or evicted since we opened it
+        self._total = self._stored_bytes()
+        target = int(self.max_bytes * self.EVICT_TO)
+        while self._total > target:
+            oldest = self.conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access ASC LIMIT ?", (self.EVICT_CHUNK,)
+            ).fetchall()
+            if not oldest:
+                break
+            doomed = []
+            for key, size in oldest:
+                if self._total <= target:
+                    break
+                doomed.append((key,))
+                self._total -= size
+            self.conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def flush(self) -> None:
+        """Write back pending access times."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid() and self._touched:
+                self._write_touched()
+                self._conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        self.flush()
+        with self._lock:
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM entries")
+            self.conn.commit()
+            self._total = 0
+            self._touched, self._pending_hits = {}, 0
@@ -3,56 +3,82 @@ Multi-Graph Contradiction Network with spectral conflict score.
 """
 from typing import List, Dict, Any
 import numpy as np
+from urva.utils.seed import stable_seed
+from urva.graph.relations import CONTRADICTION, ENTAILMENT, NEUTRAL, classify_pairs, negation_flags
+from urva.graph.edges import EdgeTable
+from urva.graph.lsh import approximate_relations
+from urva.graph.spectral import dense_mean_abs_eig, mean_abs_eigenvalue, random_bipartite_mean_abs
 
 
 class ConflictGraph:
     """
     Builds pairwise relations between sentences; computes contradictions, confirmations,
-    and a spectral conflict score on the adjacency matrix.
+    and a spectral conflict score on the adjacency matrix (dense symmetric solver up to
+    ``spectral_dense_max`` nodes, sparse Lanczos estimate beyond).
+
+    On the approximate path the low-similarity contradictions are only sampled, never
+    listed. The spectral term still accounts for them: their expected value enters as a
+    constant block between negated and plain sentences, and the spread around it as the
+    Marchenko-Pastur estimate for a random block of that size.
     """
 
-    def __init__(self, lambda_conflict: float = 0.5):
+    def __init__(self, lambda_conflict: float = 0.5, approximate: bool = False, approx_min_sentences: int = 256,
+                 lsh_recall: float = 0.95, approx_sample: int = 4096, lsh_max_bands: int = 32,
+                 spectral_dense_max: int = 512, spectral_tol: float = 1e-2):
         self.lambda_conflict = lambda_conflict
+        self.approximate = approximate
+        self.approx_min_sentences = approx_min_sentences
+        self.lsh_recall = lsh_recall
+        self.approx_sample = approx_sample
+        self.lsh_max_bands = lsh_max_bands
+        self.spectral_dense_max = spectral_dense_max
+        self.spectral_tol = spectral_tol
 
     def _embed(self, sent: str, dim: int = 128) -> np.ndarray:
-        rng = np.random.default_rng(abs(hash(sent)) % (2**31 - 1))
+        rng = np.random.default_rng(stable_seed(sent))
         return rng.normal(size=(dim,))
 
-    def _rel_type(self, a: str, b: str) -> str:
-        ea, eb = self._embed(a), self._embed(b)
-        sim = float(np.dot(ea, eb) / (np.linalg.norm(ea) * np.linalg.norm(eb) + 1e-8))
-        neg_tokens = {"not", "never", "no", "cannot"}
-        has_neg_a = any(tok in a.lower() for tok in neg_tokens)
-        has_neg_b = any(tok in b.lower() for tok in neg_tokens)
-        if sim > 0.65 and has_neg_a != has_neg_b:
-            return "contradiction"
-        if sim > 0.7:
-            return "entailment"
-        if sim < 0.2 and has_neg_a != has_neg_b:
-            return "contradiction"
-        return "neutral"
-
     def build(self, sentences: List[str]) -> Dict[str, Any]:
-        edges = []
+        n = len(sentences)
+        rows = cols = np.zeros(0, dtype=np.int64)
+        weights = np.zeros(0)
+        block, noise = None, 0.0
+        edges = EdgeTable.empty(sentences)
         contradictions = 0
         confirmations = 0
-        n = len(sentences)
-        adj = np.zeros((n, n))
-        for i in range(n):
-            for j in range(i + 1, n):
-                rel = self._rel_type(sentences[i], sentences[j])
-                edges.append({"a": sentences[i], "b": sentences[j], "type": rel})
-                if rel == "contradiction":
-                    contradictions += 1
-                    adj[i, j] = adj[j, i] = -1
-                elif rel == "entailment":
-                    confirmations += 1
-                    adj[i, j] = adj[j, i] = 1
-        total = max(len(edges), 1)
+        total = 1
+        approximate = self.approximate and n >= self.approx_min_sentences
+        if n > 1:
+            emb = np.stack([self._embed(s) for s in sentences])
+            neg = negation_flags(sentences)
+            if approximate:
+                approx = approximate_relations(emb, neg, recall=self.lsh_recall, sample_size=self.approx_sample,
+                                               max_bands=self.lsh_max_bands)
+                rows, cols, codes = approx["rows"], approx["cols"], approx["codes"]
+                contradictions, confirmations = approx["contradictions"], approx["confirmations"]
+                total = approx["total"]
+            else:
+                rows, cols, codes = classify_pairs(emb, neg)
+                contradictions = int(np.count_nonzero(codes == CONTRADICTION))
+                confirmations = int(np.count_nonzero(codes == ENTAILMENT))
+                total = max(len(codes), 1)
+            edges = EdgeTable(sentences, rows, cols, codes)
+            # signed adjacency as an edge list: contradiction -1, entailment +1
+            signed = codes != NEUTRAL
+            weights = np.where(codes[signed] == CONTRADICTION, -1.0, 1.0)
+            rows, cols = rows[signed], cols[signed]
+            rate = approx["low_contradiction_rate"] if approximate else 0.0
+            if rate:
+                negs, poss = np.flatnonzero(neg), np.flatnonzero(~neg)
+                block = (negs, poss, -rate)
+                # listed negated/plain edges already carry their exact weight
+                weights = weights + np.where(neg[rows] != neg[cols], rate, 0.0)
+                noise = random_bipartite_mean_abs(n, len(negs), len(poss), rate * (1 - rate))
         conflict_score = contradictions / total
-        spectral = self._spectral_conflict(adj)
+        spectral = noise + mean_abs_eigenvalue(n, rows, cols, weights, dense_max=self.spectral_dense_max,
+                                               tol=self.spectral_tol, block=block)
         combined = self.lambda_conflict * conflict_score + (1 - self.lambda_conflict) * spectral
-        return {
+        result = {
             "contradictions": contradictions,
             "confirmations": confirmations,
             "total_relations": total,
@@ -60,12 +86,10 @@ class ConflictGraph:
             "edges": edges,
             "spectral": spectral,
         }
+        if approximate:
+            result["approximate"] = True
+            result["estimated_neutral"] = max(total - contradictions - confirmations, 0)
+        return result
 
     def _spectral_conflict(self, adj: np.ndarray) -> float:
-        if adj.size == 0:
-            return 0.0
-        try:
-            eigs = np.linalg.eigvals(adj)
-            return float(np.mean(np.abs(eigs)))
-        except np.linalg.LinAlgError:
-            return 0.0
+        return dense_mean_abs_eig(adj)
@@ -0,0 +1,202 @@
+"""
+Incremental conflict graph for auditing streamed generations.
+
+Each ``add_sentence`` relates the new sentence only to the nodes already present:
+one matvec against the stored embedding matrix for the ``ConflictGraph`` relations,
+and an inverted token index for the ``ContradictionGraph`` relations. Counts and the
+conflict score are therefore exact after every sentence; the spectral term is
+refreshed whenever the node count has grown by ``spectral_refresh``, which keeps the
+total work over a stream of ``n`` sentences at O(n^2).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+from urva.graph.contradiction import CONTRADICTION_LABELS, ConflictResult, ContradictionGraph
+from urva.graph.edges import EdgeTable
+from urva.graph.relations import CONTRADICTION, ENTAILMENT, NEG_TOKENS, NEUTRAL, classify
+from urva.graph.spectral import mean_abs_eigenvalue
+from urva.reasoning.conflict_graph import ConflictGraph
+
+
+class IncrementalConflictGraph:
+    def __init__(self, conflict_graph: Optional[ConflictGraph] = None,
+                 contradiction_graph: Optional[ContradictionGraph] = None,
+                 conflict_threshold: float = 0.25, logic=None, spectral_refresh: float = 0.25, dim: int = 128):
+        self.graph = conflict_graph or ConflictGraph()
+        self.contradiction_graph = contradiction_graph or ContradictionGraph()
+        self.conflict_threshold = conflict_threshold
+        self.logic = logic
+        self.spectral_refresh = spectral_refresh
+        self.dim = dim
+
+        self.sentences: List[str] = []
+        self._emb = np.zeros((16, dim))
+        self._norms = np.zeros(16)
+        self._neg = np.zeros(16, dtype=bool)
+        self._codes: List[np.ndarray] = []
+        self.contradictions = 0
+        self.confirmations = 0
+
+        # ContradictionGraph view: lowercased nodes, token index, exact-duplicate counts
+        self._lower: List[str] = []
+        self._neg_lower: List[bool] = []
+        self._token_index: Dict[str, List[int]] = {}
+        self._seen: Dict[str, int] = {}
+        self._cg_edges: List[Tuple[int, int, str]] = []
+        self.cg_contradictions = 0
+        self.cg_confirmations = 0
+
+        self.violations: List[Dict[str, Any]] = []
+        self._spectral = 0.0
+        self._spectral_nodes = 0
+
+    def __len__(self) -> int:
+        return len(self.sentences)
+
+    def _grow(self) -> None:
+        cap = self._emb.shape[0] * 2
+        emb = np.zeros((cap, self.dim))
+        emb[: len(self)] = self._emb[: len(self)]
+        norms = np.zeros(cap)
+        norms[: len(self)] = self._norms[: len(self)]
+        neg = np.zeros(cap, dtype=bool)
+        neg[: len(self)] = self._neg[: len(self)]
+        self._emb, self._norms, self._neg = emb, norms, neg
+
+    def _relate_embeddings(self, sent: str) -> np.ndarray:
+        n = len(self)
+        if n == self._emb.shape[0]:
+            self._grow()
+        e = self.graph._embed(sent, dim=self.dim)
+        norm = float(np.linalg.norm(e))
+        neg = any(tok in sent.lower() for tok in NEG_TOKENS)
+        sims = (self._emb[:n] @ e) / (self._norms[:n] * norm + 1e-8)
+        codes = classify(sims, self._neg[:n], np.full(n, neg))
+        self._emb[n], self._norms[n], self._neg[n] = e, norm, neg
+        self.contradictions += int(np.count_nonzero(codes == CONTRADICTION))
+        self.confirmations += int(np.count_nonzero(codes == ENTAILMENT))
+        self._codes.append(codes)
+        return codes
+
+    def _relate_tokens(self, sent: str) -> None:
+        lower = sent.lower()
+        j = len(self._lower)
+        dup = self._seen.get(lower, 0)
+        if dup:
+            for i, node in enumerate(self._lower):
+                if node == lower:
+                    self._cg_edges.append((i, j, "confirm"))
+            self.cg_confirmations += dup
+        neg = "not" in lower or "no" in lower
+        shared: Dict[int, int] = {}
+        tokens = set(lower.split())
+        for tok in tokens:
+            for i in self._token_index.get(tok, ()):
+                shared[i] = shared.get(i, 0) + 1
+        for i in sorted(shared):
+            if shared[i] >= 2 and self._neg_lower[i] != neg and self._lower[i] != lower:
+                self._cg_edges.append((i, j, "contradict"))
+                self.cg_contradictions += 1
+        for tok in tokens:
+            self._token_index.setdefault(tok, []).append(j)
+        self._lower.append(lower)
+        self._neg_lower.append(neg)
+        self._seen[lower] = dup + 1
+
+    def add_sentence(self, sent: str) -> Dict[str, Any]:
+        """Adds one sentence and returns the updated scores, including a mid-stream verdict."""
+        sent = sent.strip()
+        if not sent:
+            return self.status()
+        self._relate_embeddings(sent)
+        self._relate_tokens(sent)
+        self.sentences.append(sent)
+        if self.logic is not None:
+            self.violations.extend(self.logic.apply_rules(sent))
+        if len(self) >= max(self._spectral_nodes * (1.0 + self.spectral_refresh), self._spectral_nodes + 1):
+            self._refresh_spectral()
+        return self.status()
+
+    def add_text(self, text: str) -> Dict[str, Any]:
+        for sent in self.contradiction_graph._sentences(text):
+            self.add_sentence(sent)
+        return self.status()
+
+    def _edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if len(self) < 2:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=np.uint8)
+        cols = np.concatenate([np.full(len(c), j + 1, dtype=np.int64) for j, c in enumerate(self._codes[1:])])
+        rows = np.concatenate([np.arange(len(c), dtype=np.int64) for c in self._codes[1:]])
+        codes = np.concatenate(self._codes[1:])
+        order = np.lexsort((cols, rows))
+        return rows[order], cols[order], codes[order]
+
+    def _refresh_spectral(self) -> None:
+        rows, cols, codes = self._edge_arrays()
+        signed = codes != NEUTRAL
+        weights = np.where(codes[signed] == CONTRADICTION, -1.0, 1.0)
+        self._spectral = mean_abs_eigenvalue(len(self), rows[signed], cols[signed], weights,
+                                             dense_max=self.graph.spectral_dense_max, tol=self.graph.spectral_tol)
+        self._spectral_nodes = len(self)
+
+    @property
+    def total_relations(self) -> int:
+        n = len(self)
+        return max(n * (n - 1) // 2, 1)
+
+    @property
+    def conflict_score(self) -> float:
+        return self.contradictions / self.total_relations
+
+    def spectral(self, refresh: bool = False) -> float:
+        if refresh and self._spectral_nodes != len(self):
+            self._refresh_spectral()
+        return self._spectral
+
+    def status(self) -> Dict[str, Any]:
+        has_conflict = self.conflict_score > self.conflict_threshold
+        lam = self.graph.lambda_conflict
+        return {
+            "sentences": len(self),
+            "contradictions": self.contradictions,
+            "confirmations": self.confirmations,
+            "total_relations": self.total_relations,
+            "conflict_score": self.conflict_score,
+            "combined_score": lam * self.conflict_score + (1 - lam) * self._spectral,
+            "spectral": self._spectral,
+            "violations": len(self.violations),
+            "has_hallucination": bool(self.violations or has_conflict),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Same shape as ``ConflictGraph.build`` on the sentences seen so far."""
+        rows, cols, codes = self._edge_arrays()
+        spectral = self.spectral(refresh=True)
+        lam = self.graph.lambda_conflict
+        return {
+            "contradictions": self.contradictions,
+            "confirmations": self.confirmations,
+            "total_relations": self.total_relations,
+            "conflict_score": lam * self.conflict_score + (1 - lam) * spectral,
+            "edges": EdgeTable(self.sentences, rows, cols, codes),
+            "spectral": spectral,
+        }
+
+    def contradiction_result(self) -> ConflictResult:
+        """Same as ``ContradictionGraph.build`` on the sentences seen so far."""
+        total = self.cg_contradictions + self.cg_confirmations
+        edges = sorted(self._cg_edges)
+        return ConflictResult(
+            contradictions=self.cg_contradictions,
+            confirmations=self.cg_confirmations,
+            total_relations=total,
+            conflict_score=self.cg_contradictions / total if total else 0.0,
+            edges=EdgeTable(
+                self._lower,
+                [i for i, _, _ in edges],
+                [j for _, j, _ in edges],
+                [CONTRADICTION_LABELS.index(kind) for _, _, kind in edges],
+                labels=CONTRADICTION_LABELS,
+            ),
+        )
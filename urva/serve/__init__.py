@@ -0,0 +1,3 @@
+from .server import AuditServer, MicroBatcher, to_response
+
+__all__ = ["AuditServer", "MicroBatcher", "to_response"]
@@ -0,0 +1,229 @@
+"""
+Long-running asyncio audit server with dynamic micro-batching.
+
+Concurrent requests are queued and grouped into ``run_batch`` calls of up to
+``max_batch`` items, waiting at most ``max_wait_ms`` after the first queued request.
+The pipeline runs on a single background thread so the event loop keeps accepting
+connections while a batch is in flight.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from urva.models.sbert import sbert_stats
+from urva.pipeline.formatting import format_output
+
+
+def to_response(out: Any) -> Dict[str, Any]:
+    """
+    JSON-safe subset of a pipeline output (``InferenceResult`` or a result dict) that
+    ``format_output`` can still render.
+    """
+    fusion = out.get("fusion", {})
+    hall = out.get("hallucination", {})
+    return {
+        "id": out.get("id"),
+        "final_answer": out.get("final_answer", ""),
+        "summary": out.get("summary", ""),
+        "evidence": out.get("evidence", ""),
+        "fusion": {
+            "certainty": fusion.get("certainty", 0.0),
+            "reasoning_alignment": fusion.get("reasoning_alignment", 0.0),
+            "conflict_score": fusion.get("conflict_score", 0.0),
+            "rule_violations": fusion.get("rule_violations", []),
+        },
+        "hallucination": {
+            "violations": hall.get("violations", []),
+            "has_hallucination": hall.get("has_hallucination", False),
+            "type": hall.get("type", "NONE"),
+            "explanation": hall.get("explanation", ""),
+        },
+        "formatted": format_output(out),
+    }
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, math.ceil(q / 100.0 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+class MicroBatcher:
+    def __init__(self, pipeline, max_batch: int = 16, max_wait_ms: float = 5.0, latency_window: int = 10000):
+        self.pipeline = pipeline
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: Optional[asyncio.Queue] = None
+        self.latencies: deque = deque(maxlen=latency_window)
+        self.batch_sizes: deque = deque(maxlen=latency_window)
+        self.served = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="urva-batch")
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self.queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, item: Dict[str, Any], speed: str = "balanced") -> Dict[str, Any]:
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, speed, fut, time.perf_counter()))
+        return await fut
+
+    async def _collect(self) -> List[Tuple[Dict[str, Any], str, asyncio.Future, float]]:
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            by_speed: Dict[str, List] = {}
+            for entry in batch:
+                by_speed.setdefault(entry[1], []).append(entry)
+            for speed, entries in by_speed.items():
+                items = [e[0] for e in entries]
+                try:
+                    outs = await loop.run_in_executor(
+                        self._executor, lambda: self.pipeline.run_batch(items, speed=speed)
+                    )
+                except Exception as exc:
+                    for _, _, fut, _ in entries:
+                        if not fut.done():
+                            fut.set_exception(exc)
+                    continue
+                done = time.perf_counter()
+                self.batch_sizes.append(len(entries))
+                for (_, _, fut, t0), out in zip(entries, outs):
+                    self.latencies.append(done - t0)
+                    self.served += 1
+                    if not fut.done():
+                        fut.set_result(out)
+
+    def stats(self) -> Dict[str, Any]:
+        lat_ms = [x * 1000.0 for x in self.latencies]
+        sizes = list(self.batch_sizes)
+        return {
+            "served": self.served,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "latency_p50_ms": _percentile(lat_ms, 50),
+            "latency_p99_ms": _percentile(lat_ms, 99),
+            "avg_batch_size": sum(sizes) / len(sizes) if sizes else 0.0,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class AuditServer:
+    """
+    Minimal HTTP/1.1 JSON endpoint over TCP or a Unix socket.
+
+    ``POST /audit`` with ``{"text": ..., "id": ..., "speed": ...}`` returns ``to_response``;
+    ``GET /stats`` reports latency percentiles, queue depth and SBERT load times; ``GET /health`` is a liveness probe.
+    """
+
+    def __init__(self, pipeline, max_batch: int = 16, max_wait_ms: float = 5.0,
+                 host: str = "127.0.0.1", port: int = 8080, unix_socket: Optional[str] = None):
+        self.batcher = MicroBatcher(pipeline, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            return 200, {**self.batcher.stats(), "sbert": sbert_stats()}
+        if path != "/audit":
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError as exc:
+            return 400, {"error": f"invalid JSON: {exc}"}
+        if not isinstance(payload, dict) or not isinstance(payload.get("text"), str):
+            return 400, {"error": "expected an object with a 'text' string"}
+        item = {"id": payload.get("id"), "text": payload["text"]}
+        try:
+            out = await self.batcher.submit(item, speed=payload.get("speed", "balanced"))
+        except Exception as exc:
+            return 500, {"error": str(exc)}
+        return 200, to_response(out)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                if len(parts) < 2:
+                    break
+                method, path = parts[0].upper(), parts[1].split("?", 1)[0]
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self._dispatch(method, path, body)
+                data = json.dumps(payload).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_forever(self) -> None:
+        self.batcher.start()
+        if self.unix_socket:
+            server = await asyncio.start_unix_server(self._handle, path=self.unix_socket)
+        else:
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+    def run(self) -> None:
+        asyncio.run(self.serve_forever())
@@ -1,7 +1,8 @@
 from .text import split_sentences
-from .seed import set_seed
-from .device import get_device
+from .seed import set_seed, stable_seed
+from .device import get_device, module_device, detach_tree
 from .logging import JsonLogger, TraceBuffer
+from .lru import LRUCache
 from .retrieval import VectorStore, retrieve_topk
 from .trace import TraceRecorder
 from .visualize import export_conflict_graph
@@ -10,9 +11,13 @@ from .verification import verify_facts
 __all__ = [
     "split_sentences",
     "set_seed",
+    "stable_seed",
     "get_device",
+    "module_device",
+    "detach_tree",
     "JsonLogger",
     "TraceBuffer",
+    "LRUCache",
     "VectorStore",
     "retrieve_topk",
     "TraceRecorder",
@@ -1,5 +1,33 @@
+import dataclasses
+from typing import Any
 import torch
 
 
 def get_device(name: str) -> torch.device:
     return torch.device(name if torch.cuda.is_available() or "cuda" not in name else "cpu")
+
+
+def module_device(module: torch.nn.Module) -> torch.device:
+    """
+    Device of a module's first parameter or buffer, CPU when it has neither; safe for
+    dynamically quantized modules, whose packed weights are not ``nn.Parameter``s.
+    """
+    for tensor in module.parameters():
+        return tensor.device
+    for tensor in module.buffers():
+        return tensor.device
+    return torch.device("cpu")
+
+
+def detach_tree(obj: Any) -> Any:
+    """Detach every tensor nested in dicts/lists/dataclasses so results can be pickled or cached."""
+    if isinstance(obj, torch.Tensor):
+        return obj.detach()
+    if isinstance(obj, dict):
+        return {k: detach_tree(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [detach_tree(v) for v in obj]
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # e.g. InferenceResult
+        return dataclasses.replace(obj, **{f.name: detach_tree(getattr(obj, f.name)) for f in dataclasses.fields(obj)})
+    return obj
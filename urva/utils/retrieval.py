@@ -1,31 +1,279 @@
 """
 Simple retrieval and vector store stubs for retrieval-augmented reasoning.
+
+``VectorStore`` keeps L2-normalized float32 embeddings as rows of one contiguous
+matrix, so a query is a single matvec plus an ``argpartition`` top-k and a batch of
+queries is a single matmul.
+
+``save``/``open`` persist the store as a directory holding ``embeddings.npy`` (a plain
+``.npy`` matrix whose header is padded to a fixed size, so its shape can be rewritten
+in place), ``ids.bin`` (concatenated UTF-8 doc ids) and ``offsets.npy`` (uint64 start
+of each id in ``ids.bin``, plus the end). ``open(path, mmap=True)`` maps the files
+read-only without copying or decoding, so forked workers share one page-cached index;
+adds to such a store are appended to the files under an exclusive ``flock``, and the
+embedding shape is updated last so readers never see a partial append.
 """
-from typing import List, Tuple
+import os
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 import numpy as np
+from urva.utils.seed import stable_seed
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+_MIN_CAPACITY = 1024
+# score block cap for search_many (floats): bounds the (queries x docs) temporary
+_BLOCK_FLOATS = 1 << 24
+# .npy v1 header size reserved on save; big enough for any 2-D shape
+_HEADER_BYTES = 128
+_EMBEDDINGS, _IDS, _OFFSETS = "embeddings.npy", "ids.bin", "offsets.npy"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / (norms + 1e-8)
+
+
+def _topk(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the ``top_k`` best scores along the last axis, best first; ties keep insertion order."""
+    n = scores.shape[-1]
+    if top_k >= n:
+        return np.argsort(-scores, axis=-1, kind="stable")
+    idx = np.sort(np.argpartition(-scores, top_k - 1, axis=-1)[..., :top_k], axis=-1)
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(idx, order, axis=-1)
+
+
+@contextmanager
+def _locked(root: Path) -> Iterator[None]:
+    with open(root / "lock", "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _npy_header(dtype: np.dtype, shape: Tuple[int, ...]) -> bytes:
+    header = repr({"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False,
+                   "shape": tuple(int(d) for d in shape)}).encode("latin1")
+    pad = _HEADER_BYTES - 10 - len(header) - 1
+    if pad < 0:
+        raise ValueError(f"shape {shape} does not fit the reserved .npy header")
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", _HEADER_BYTES - 10) + header + b" " * pad + b"\n"
+
+
+def _npy_shape(path: Path) -> Tuple[int, ...]:
+    with open(path, "rb") as f:
+        np.lib.format.read_magic(f)
+        shape, _, _ = np.lib.format.read_array_header_1_0(f)
+        if f.tell() != _HEADER_BYTES:
+            raise ValueError(f"{path} was not written by VectorStore.save")
+    return shape
+
+
+def _write_npy(path: Path, array: np.ndarray) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_npy_header(array.dtype, array.shape))
+        np.ascontiguousarray(array).tofile(f)
+    os.replace(tmp, path)
+
+
+def _append_npy(path: Path, count: int, rows: np.ndarray) -> None:
+    """Write ``rows`` after the first ``count`` committed rows, then publish the new shape."""
+    with open(path, "r+b") as f:
+        f.seek(_HEADER_BYTES + count * rows[0].nbytes)
+        rows.tofile(f)
+        f.truncate()
+        f.flush()
+        f.seek(0)
+        f.write(_npy_header(rows.dtype, (count + len(rows),) + rows.shape[1:]))
+
+
+def _map(path: Path, mmap: bool) -> np.ndarray:
+    if not mmap:
+        return np.load(path)
+    shape = _npy_shape(path)
+    if 0 in shape:
+        return np.load(path)
+    return np.load(path, mmap_mode="r")
+
+
+def _map_bytes(path: Path, mmap: bool) -> np.ndarray:
+    if mmap and path.stat().st_size:
+        return np.memmap(path, dtype=np.uint8, mode="r")
+    return np.fromfile(path, dtype=np.uint8)
+
+
+class _DocIds(Sequence[str]):
+    """Doc ids of a mapped index, decoded from ``ids.bin`` on access."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, size: int):
+        self.blob = blob
+        self.offsets = offsets
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        return self.blob[self.offsets[i]: self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(self.size))
 
 
 class VectorStore:
     def __init__(self, dim: int = 256):
         self.dim = dim
-        self.docs: List[Tuple[str, np.ndarray]] = []
+        self.ids: Sequence[str] = []
+        self._matrix = np.empty((0, dim), dtype=np.float32)
+        # index directory when opened with mmap=True; adds are then appended to its files
+        self.path: Optional[Path] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Normalized embeddings of the stored documents, one row per doc (a view)."""
+        return self._matrix[: len(self.ids)]
+
+    @property
+    def docs(self) -> Tuple[Tuple[str, np.ndarray], ...]:
+        """Read-only ``(doc_id, row)`` view; add documents with ``add``/``add_many``/``add_vectors``."""
+        return tuple(zip(self.ids, self.matrix))
+
+    def _reserve(self, extra: int) -> None:
+        needed = len(self.ids) + extra
+        if needed <= self._matrix.shape[0]:
+            return
+        capacity = max(needed, 2 * self._matrix.shape[0], _MIN_CAPACITY)
+        grown = np.empty((capacity, self.dim), dtype=np.float32)
+        grown[: len(self.ids)] = self.matrix
+        self._matrix = grown
 
     def add(self, doc_id: str, text: str) -> None:
-        emb = self.embed(text)
-        self.docs.append((doc_id, emb))
+        self.add_vectors([doc_id], self.embed(text)[None, :])
+
+    def add_many(self, docs: Iterable[Tuple[str, str]]) -> None:
+        docs = list(docs)
+        if docs:
+            self.add_vectors([doc_id for doc_id, _ in docs], np.stack([self.embed(text) for _, text in docs]))
+
+    def add_vectors(self, doc_ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Bulk add precomputed embeddings of shape ``(len(doc_ids), dim)``; rows are normalized here."""
+        vectors = np.asarray(vectors)
+        if vectors.shape != (len(doc_ids), self.dim):
+            raise ValueError(f"expected vectors of shape ({len(doc_ids)}, {self.dim}), got {vectors.shape}")
+        if self.path is not None:
+            if len(doc_ids):
+                self._append(doc_ids, _normalize(vectors))
+            return
+        self._reserve(len(doc_ids))
+        start = len(self.ids)
+        self._matrix[start: start + len(doc_ids)] = _normalize(vectors)
+        self.ids.extend(doc_ids)
+
+    # ----------------- Persistence -----------------
+    def save(self, path: str) -> str:
+        """Write the index directory; files are replaced whole, so open maps keep their snapshot."""
+        root = Path(path)
+        if self.path is not None and root.resolve() == self.path.resolve():
+            return str(root)
+        root.mkdir(parents=True, exist_ok=True)
+        ids = [doc_id.encode("utf-8") for doc_id in self.ids]
+        offsets = np.zeros(len(ids) + 1, dtype=np.uint64)
+        np.cumsum([len(b) for b in ids], out=offsets[1:])
+        with _locked(root):
+            _write_npy(root / _OFFSETS, offsets)
+            tmp = root / (_IDS + ".tmp")
+            tmp.write_bytes(b"".join(ids))
+            os.replace(tmp, root / _IDS)
+            # written last: its shape is what readers trust
+            _write_npy(root / _EMBEDDINGS, self.matrix)
+        return str(root)
+
+    @classmethod
+    def open(cls, path: str, mmap: bool = True) -> "VectorStore":
+        """
+        Load an index written by ``save``. With ``mmap`` nothing is copied or decoded up
+        front and later adds are appended to the index files; without it the index is
+        read into an ordinary in-memory store.
+        """
+        root = Path(path)
+        store = cls(dim=_npy_shape(root / _EMBEDDINGS)[1])
+        store._load(root, mmap)
+        if mmap:
+            store.path = root
+        return store
+
+    def _load(self, root: Path, mmap: bool) -> None:
+        with _locked(root):
+            matrix = _map(root / _EMBEDDINGS, mmap)
+            offsets = _map(root / _OFFSETS, mmap)
+            blob = _map_bytes(root / _IDS, mmap)
+        ids = _DocIds(blob, offsets, len(matrix))
+        self._matrix = matrix
+        self.ids = ids if mmap else list(ids)
+
+    def _append(self, doc_ids: Sequence[str], rows: np.ndarray) -> None:
+        encoded = [doc_id.encode("utf-8") for doc_id in doc_ids]
+        with _locked(self.path):
+            # committed size, which may include rows appended by other processes
+            n = _npy_shape(self.path / _EMBEDDINGS)[0]
+            with open(self.path / _OFFSETS, "rb") as f:
+                f.seek(_HEADER_BYTES + 8 * n)
+                end = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+            with open(self.path / _IDS, "r+b") as f:
+                f.seek(end)
+                f.write(b"".join(encoded))
+                f.truncate()
+            offsets = end + np.cumsum([len(b) for b in encoded], dtype=np.uint64)
+            _append_npy(self.path / _OFFSETS, n + 1, offsets)
+            _append_npy(self.path / _EMBEDDINGS, n, rows)
+        self._load(self.path, mmap=True)
 
     def embed(self, text: str) -> np.ndarray:
-        rng = np.random.default_rng(abs(hash(text)) % (2**31 - 1))
+        rng = np.random.default_rng(stable_seed(text))
         return rng.normal(size=(self.dim,))
 
-    def search(self, query: str, top_k: int = 5) -> List[Tuple[str, float]]:
-        q_emb = self.embed(query)
-        sims = []
-        for doc_id, emb in self.docs:
-            sim = float(np.dot(q_emb, emb) / (np.linalg.norm(q_emb) * np.linalg.norm(emb) + 1e-8))
-            sims.append((doc_id, sim))
-        sims.sort(key=lambda x: x[1], reverse=True)
-        return sims[:top_k]
+    def _query(self, query: str | np.ndarray) -> np.ndarray:
+        return _normalize(self.embed(query) if isinstance(query, str) else query)
+
+    def search(self, query: str | np.ndarray, top_k: int = 5) -> List[Tuple[str, float]]:
+        """``query`` is a text or an already computed embedding."""
+        if not self.ids or top_k <= 0:
+            return []
+        scores = self.matrix @ self._query(query)
+        return [(self.ids[i], float(scores[i])) for i in _topk(scores, top_k)]
+
+    def search_many(self, queries: Sequence[str | np.ndarray], top_k: int = 5) -> List[List[Tuple[str, float]]]:
+        """Batched ``search``: one matmul per block of queries."""
+        if not self.ids or top_k <= 0 or len(queries) == 0:
+            return [[] for _ in queries]
+        q = np.stack([self._query(query) for query in queries])
+        block = max(1, _BLOCK_FLOATS // len(self.ids))
+        results = []
+        for start in range(0, len(q), block):
+            scores = q[start: start + block] @ self.matrix.T
+            top = _topk(scores, top_k)
+            best = np.take_along_axis(scores, top, axis=-1)
+            results.extend([(self.ids[i], float(s)) for i, s in zip(row, vals)] for row, vals in zip(top, best))
+        return results
 
 
 def retrieve_topk(store: VectorStore, query: str, top_k: int = 5) -> List[Tuple[str, float]]:
@@ -1,3 +1,4 @@
+import hashlib
 import random
 import numpy as np
 import torch
@@ -10,3 +11,9 @@ def set_seed(seed: int) -> None:
     torch.cuda.manual_seed_all(seed)
     torch.backends.cudnn.deterministic = True
     torch.backends.cudnn.benchmark = False
+
+
+def stable_seed(text: str) -> int:
+    """Process-independent replacement for ``abs(hash(text)) % (2**31 - 1)``."""
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little") % (2**31 - 1)
@@ -5,9 +5,16 @@ from typing import Dict, Any, List
 
 
 def export_conflict_graph(graph: Dict[str, Any]) -> Dict[str, Any]:
+    edges = graph.get("edges", [])
+    if hasattr(edges, "to_dicts"):
+        # EdgeTable: materialize dicts only here, at the export boundary
+        nodes = edges.nodes()
+        edges = edges.to_dicts()
+    else:
+        nodes = list({n for e in edges for n in [e.get("a"), e.get("b")] if n})
     return {
-        "nodes": list({n for e in graph.get("edges", []) for n in [e.get("a"), e.get("b")] if n}),
-        "edges": graph.get("edges", []),
+        "nodes": nodes,
+        "edges": edges,
         "conflict_score": graph.get("conflict_score", 0.0),
         "spectral": graph.get("spectral", 0.0),
     }